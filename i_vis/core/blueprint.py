@@ -9,11 +9,14 @@ The existing pagination implemention has been extended to support:
 Extended pagination can be used by using this custom :class:`Blueprint` implementation.
 """
 
+import base64
+import binascii
 import http
-import math
-from copy import deepcopy
+import itertools
+import json
+import operator
 from dataclasses import dataclass
-from functools import wraps, cache
+from functools import wraps, cache, lru_cache
 from typing import (
     Any,
     cast,
@@ -24,17 +27,19 @@ from typing import (
     Mapping,
     Optional,
     Sequence,
+    Tuple,
     Union,
     TYPE_CHECKING
 )
 
 import flask_smorest
 from flask_smorest.utils import unpack_tuple_response
-from flask import request
-from marshmallow import RAISE, EXCLUDE, post_load
+from flask import g, request
+from marshmallow import RAISE, EXCLUDE, ValidationError, post_load
 from marshmallow.validate import Range
 from webargs.flaskparser import FlaskParser
-from sqlalchemy import Column
+from sqlalchemy import Column, tuple_
+from sqlalchemy.orm import selectinload
 from .ma import ma
 
 if TYPE_CHECKING:
@@ -49,6 +54,15 @@ SIZE = 50
 #: Maximum size of elements of a page
 MAX_SIZE = 100
 
+#: Key of a page: a single value or a tuple of values for composite keys
+Key = Union[int, Tuple[Any, ...]]
+
+#: Version of cursor format
+CURSOR_VERSION = 1
+
+#: Types of values allowed in composite keys of a cursor
+_KEY_SCALARS = (str, int, float, bool)
+
 
 class StrictFlaskParser(FlaskParser):
     DEFAULT_UNKNOWN_BY_LOCATION = {
@@ -59,7 +73,9 @@ class StrictFlaskParser(FlaskParser):
 class PaginationParameters:
     """Container for pagination parameters."""
 
-    def __init__(self, current_id: int, size: int, max_size: int) -> None:
+    __slots__ = ("current_id", "size", "max_size")
+
+    def __init__(self, current_id: Key, size: int, max_size: int = MAX_SIZE) -> None:
         self.current_id = current_id
         self.size = size
         self.max_size = max_size
@@ -71,30 +87,38 @@ class PaginationParameters:
 class PagerInfo:
     """Container for pager info."""
 
+    __slots__ = ("pagination_params", "total", "next_id", "_pages")
+
     def __init__(
             self,
             pagination_params: PaginationParameters,
             total: Optional[int] = None,
-            next_id: Optional[int] = None,
+            next_id: Optional[Key] = None,
     ) -> None:
         self.pagination_params = pagination_params
         self.total = total
         self.next_id = next_id
+        self._pages: Optional[int] = None
 
     @property
     def pages(self) -> Optional[int]:
         """Number of available pages.
 
+        The value is computed on first access and cached.
+
         Returns:
             The number of available pages or None if total is not set.
         """
 
-        if self.total is None:
-            return None
-        return math.ceil(self.total / self.pagination_params.size)
+        if self._pages is None and self.total is not None:
+            size = self.pagination_params.size
+            self._pages = (self.total + size - 1) // size
+        return self._pages
 
 
 class PaginatedResult:
+    __slots__ = ("results", "pager_info", "keys", "links")
+
     def __init__(
             self,
             results: Sequence[Any],
@@ -118,6 +142,76 @@ class PaginatedResult:
 T = TypeVar("T")
 
 
+def encode_cursor(payload: Mapping[str, Any]) -> str:
+    """Encode payload as an opaque, URL-safe cursor.
+
+    Args:
+        payload: JSON serializable payload.
+
+    Returns:
+        Base64 encoded cursor.
+    """
+
+    return base64.urlsafe_b64encode(
+        json.dumps(payload, separators=(",", ":")).encode()
+    ).decode()
+
+
+def decode_cursor(token: str) -> Mapping[str, Any]:
+    """Decode cursor created by :func:`encode_cursor`.
+
+    Args:
+        token: Cursor to decode.
+
+    Returns:
+        Decoded payload.
+
+    Raises:
+        ValueError if ``token`` is not a valid cursor.
+    """
+
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {token}") from e
+    if not isinstance(payload, dict):
+        raise ValueError(f"Invalid cursor: {token}")
+    return payload
+
+
+def encode_key(key: Key) -> str:
+    """Encode a page key as cursor."""
+
+    return encode_cursor({"k": key, "v": CURSOR_VERSION})
+
+
+def decode_key(token: str) -> Key:
+    """Decode a page key from a cursor created by :func:`encode_key`.
+
+    A valid key is an integer or a list of scalars (composite key). The arity of
+    composite keys is checked against the key columns by :func:`keyset_filter`.
+
+    Raises:
+        ValidationError if ``token`` is not a valid cursor.
+    """
+
+    try:
+        payload = decode_cursor(token)
+    except ValueError as e:
+        raise ValidationError(str(e), field_name="cursor") from e
+    key = payload.get("k")
+    if payload.get("v") == CURSOR_VERSION:
+        if isinstance(key, int) and not isinstance(key, bool):
+            return key
+        if (
+            isinstance(key, list)
+            and key
+            and all(isinstance(value, _KEY_SCALARS) for value in key)
+        ):
+            return tuple(key)
+    raise ValidationError(f"Invalid cursor: {token}", field_name="cursor")
+
+
 @cache
 def create_pagination_args_schema(
         current_id_: int = CURRENT_ID,
@@ -130,6 +224,7 @@ def create_pagination_args_schema(
             unknown = EXCLUDE
 
         current_id = ma.Integer(missing=current_id_)
+        cursor = ma.String()
         size = ma.Integer(
             missing=size_,
             validate=Range(min=1, max=max_size_),
@@ -141,8 +236,11 @@ def create_pagination_args_schema(
         def make_parameters(
                 self, data: Mapping[str, Any], **_kwargs: Any
         ) -> PaginationParameters:
+            current_id: Key = data.get("current_id", current_id_)
+            if "cursor" in data:
+                current_id = decode_key(data["cursor"])
             return PaginationParameters(
-                current_id=data.get("current_id", current_id_),
+                current_id=current_id,
                 size=data.get("size", size_),
                 max_size=data.get("max_size", max_size_),
             )
@@ -150,6 +248,17 @@ def create_pagination_args_schema(
     return PaginationArgumentsSchema
 
 
+@cache
+def _get_schema_instance(
+        current_id: int = CURRENT_ID,
+        size: int = SIZE,
+        max_size: int = MAX_SIZE,
+) -> ma.Schema:
+    """Shared instance of :func:`create_pagination_args_schema` - prevents schema instantiation per request."""
+
+    return create_pagination_args_schema(current_id, size, max_size)()
+
+
 class Pager(Generic[T]):
     """Abstract class for a pager."""
 
@@ -162,11 +271,17 @@ class Pager(Generic[T]):
         self._current_id = current_id
         self._size = size
         self._max_size = max_size
+        # settings are immutable - resolve schemas once
+        self._schema = create_pagination_args_schema(current_id, size, max_size)
+        self._schema_instance = _get_schema_instance(current_id, size, max_size)
 
     def create_schema(self) -> ma.Schema:
-        return create_pagination_args_schema(
-            self._current_id, self._size, self._max_size
-        )
+        return self._schema
+
+    def get_schema(self) -> ma.Schema:
+        """Shared schema instance to parse pagination parameters."""
+
+        return self._schema_instance
 
     def paginated_result(
             self, obj: T, parameters: PaginationParameters
@@ -174,6 +289,53 @@ class Pager(Generic[T]):
         raise NotImplementedError
 
 
+def create_links(
+        links: Mapping[str, str],
+        next_callback: Callable[[str], str],
+        next_id: Optional[Key],
+) -> Mapping[str, str]:
+    """Create links of a page.
+
+    ``links`` are copied - the caller's mapping is never returned or modified.
+
+    ``next_callback`` receives the opaque cursor of the next page (see :func:`encode_key`)
+    instead of the raw key: links pass it as ``cursor=`` query argument, not ``current_id=``.
+
+    Args:
+        links: Links to include.
+        next_callback: Creates link to next page from a cursor.
+        next_id: Key of the next page or ``None`` if there is no next page.
+
+    Returns:
+        Links of a page.
+    """
+
+    if next_id is None:
+        return dict(links)
+    return {**links, "next": next_callback(encode_key(next_id))}
+
+
+def index_key(key: Key) -> int:
+    """Check that ``key`` is a valid index of an in-memory sequence.
+
+    Args:
+        key: Decoded key of a page.
+
+    Returns:
+        ``key`` as index.
+
+    Raises:
+        HTTPException (400) if ``key`` is not a non-negative integer.
+    """
+
+    if not isinstance(key, int) or isinstance(key, bool) or key < 0:
+        flask_smorest.abort(
+            http.HTTPStatus.BAD_REQUEST,
+            messages={"query": {"cursor": ["Key must be a non-negative integer"]}},
+        )
+    return cast(int, key)
+
+
 def get_next_id(current_id: int, size: int, total: int) -> Optional[int]:
     """Get next id.
 
@@ -194,14 +356,65 @@ def get_next_id(current_id: int, size: int, total: int) -> Optional[int]:
     return None
 
 
+def slice_page(obj: Any, start: int, stop: int) -> Sequence[Any]:
+    """Slice a page from an in-memory sequence.
+
+    pandas objects are sliced by position, sequences (lists, tuples, numpy arrays) by slicing -
+    numpy arrays and pandas objects return views: do not modify them while the page is being serialized.
+    Any other iterable is consumed up to ``stop``.
+
+    Args:
+        obj: Object to slice.
+        start: Start of page (inclusive).
+        stop: End of page (exclusive).
+
+    Returns:
+        Elements of page.
+    """
+
+    if hasattr(obj, "iloc"):
+        return cast(Sequence[Any], obj.iloc[start:stop])
+    if hasattr(obj, "__getitem__") and hasattr(obj, "__len__"):
+        return cast(Sequence[Any], obj[start:stop])
+    return list(itertools.islice(iter(obj), start, stop))
+
+
+class ListPager(Pager[Sequence[Any]]):
+    """Pager for in-memory sequences."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        kwargs.setdefault("current_id", 0)
+        super().__init__(**kwargs)
+
+    def paginated_result(
+            self, obj: Sequence[Any], parameters: PaginationParameters
+    ) -> PaginatedResult:
+        current_id = index_key(parameters.current_id)
+        size = parameters.size
+        total = len(obj)
+
+        pager_info = PagerInfo(
+            pagination_params=parameters,
+            next_id=get_next_id(current_id, size, total),
+            total=total,
+        )
+
+        return PaginatedResult(
+            results=slice_page(obj, current_id, current_id + size),
+            pager_info=pager_info,
+        )
+
+
 @dataclass
 class DictWrapper:
+    __slots__ = ("results", "links", "next_callback")
+
     #: Query that produces results to paginate
     results: Mapping[Any, Any]
     #: links
     links: MutableMapping[str, str]
-    #: callback for links next key
-    next_callback: Callable[[int], str]
+    #: callback for link to next page - receives the cursor, see :func:`create_links`
+    next_callback: Callable[[str], str]
 
 
 class DictPager(Pager[DictWrapper]):
@@ -212,7 +425,7 @@ class DictPager(Pager[DictWrapper]):
     def paginated_result(
             self, obj: DictWrapper, parameters: PaginationParameters
     ) -> PaginatedResult:
-        current_id = parameters.current_id
+        current_id = index_key(parameters.current_id)
         size = parameters.size
         results = obj.results
         total = len(results)
@@ -223,15 +436,15 @@ class DictPager(Pager[DictWrapper]):
             total=total,
         )
 
-        links = dict(obj.links)
-        if pager_info.next_id:
-            links["next"] = obj.next_callback(pager_info.next_id)
+        links = create_links(obj.links, obj.next_callback, pager_info.next_id)
 
-        keys = list(results.keys())
-        values = list(results.values())
+        # only materialize current page
+        page = tuple(itertools.islice(results.items(), current_id, current_id + size))
+        keys = tuple(key for key, _ in page)
+        values = tuple(value for _, value in page)
 
         return PaginatedResult(
-            results=values[current_id: (current_id + size)],
+            results=values,
             keys=keys,
             pager_info=pager_info,
             links=links,
@@ -240,44 +453,117 @@ class DictPager(Pager[DictWrapper]):
 
 @dataclass
 class QueryWrapper:
-    """Container for query pager."""
+    """Container for query pager.
 
-    #: Column used for pagination (keyset)
-    column: Column[Any]
+    No ``__slots__``: slots cannot be combined with field defaults before Python 3.10.
+    """
+
+    #: Columns used for pagination (keyset) - more than one column for stable ordering on non-unique columns
+    columns: Sequence[Column[Any]]
     #: Query that produces results to paginate
     query: "Query[Any]"
     #: links
     links: MutableMapping[str, str]
-    #: callback next
-    next_callback: Callable[[int], str]
+    #: callback for link to next page - receives the cursor, see :func:`create_links`
+    next_callback: Callable[[str], str]
+    #: Relationships (attributes or names) to load eagerly - prevents N+1 selects during serialization
+    eager: Sequence[Any] = ()
+
+
+def keyset_filter(columns: Sequence[Column[Any]], key: Key) -> Any:
+    """Create filter expression to seek past ``key``.
+
+    A single column is compared directly, composite keys use a row-value comparison:
+    ``(c1, c2) > (k1, k2)``.
+
+    Args:
+        columns: Columns of the keyset.
+        key: Last seen key (exclusive). For composite keys, a non-sequence ``key`` denotes the first page.
+
+    Returns:
+        Filter expression or ``None`` if no filter is required.
+
+    Raises:
+        ValidationError if the number of values in ``key`` does not match ``columns``.
+    """
+
+    if isinstance(key, (tuple, list)) and len(key) != len(columns):
+        raise ValidationError(
+            f"Key must have {len(columns)} value(s)", field_name="cursor"
+        )
+    if len(columns) == 1:
+        if isinstance(key, (tuple, list)):
+            (key,) = key
+        return columns[0] > key
+
+    if not isinstance(key, (tuple, list)):
+        return None
+    return tuple_(*columns) > tuple_(*key)
+
+
+@lru_cache(maxsize=None)
+def keygetter(names: Tuple[str, ...]) -> Callable[[Any], Key]:
+    """Cached getter for the key of a row.
+
+    Args:
+        names: Names of key columns.
+
+    Returns:
+        Getter that returns a single value for one column or a tuple of values for composite keys.
+    """
+
+    return operator.attrgetter(*names)
 
 
 class QueryPager(Pager[QueryWrapper]):
-    """Query pager for SQLALCHEMY queries."""
+    """Query pager for SQLALCHEMY queries.
+
+    Implements keyset pagination: ``current_id`` is interpreted as the last seen key (exclusive) and
+    the next page is retrieved with ``WHERE column > current_id ORDER BY column LIMIT size``.
+    Composite keys are supported by providing multiple columns, see :func:`keyset_filter`.
+    """
+
+    def __init__(self, include_total: bool = False, **kwargs: Any) -> None:
+        kwargs.setdefault("current_id", 0)
+        super().__init__(**kwargs)
+        self._include_total = include_total
 
     def paginated_result(
             self, obj: QueryWrapper, parameters: PaginationParameters
     ) -> PaginatedResult:
         # convenience
-        column = obj.column
+        columns = obj.columns
         query = obj.query
         current_id = parameters.current_id
         size = parameters.size
-        total = query.count()  # TODO test might be slow
+        total = None
         next_id = None
 
         # process current elements - to be displayed
+        try:
+            criterion = keyset_filter(columns, current_id)
+        except ValidationError as error:
+            flask_smorest.abort(
+                http.HTTPStatus.BAD_REQUEST,
+                messages={"query": error.normalized_messages()},
+            )
+        paged_query = query if criterion is None else query.filter(criterion)
+        if obj.eager:
+            paged_query = paged_query.options(*(selectinload(rel) for rel in obj.eager))
         results = (
-            query.filter(column >= current_id)
-                .order_by(column)
-                .limit(size + 1)  # +1 to capture the next element
+            paged_query.order_by(*columns)
+                .limit(size + 1)  # +1 to detect the next page
                 .all()
         )
         if results and len(results) > size:
-            # capture next element
-            next_id = getattr(results[size], column.name, None)
             # remove next element from result
             results = results[slice(size)]
+            # last seen key
+            next_id = keygetter(tuple(column.name for column in columns))(results[-1])
+
+        if self._include_total:
+            # counts over a subquery of the unpaged query - ORDER BY is irrelevant
+            total = query.order_by(None).count()
 
         pager_info = PagerInfo(
             pagination_params=parameters,
@@ -285,9 +571,7 @@ class QueryPager(Pager[QueryWrapper]):
             next_id=next_id,
         )
 
-        links = dict(obj.links)
-        if pager_info.next_id:
-            links["next"] = obj.next_callback(pager_info.next_id)
+        links = create_links(obj.links, obj.next_callback, pager_info.next_id)
 
         return PaginatedResult(results=results, pager_info=pager_info, links=links)
 
@@ -299,21 +583,26 @@ class KeySetPaginationMixin:
 
     @classmethod
     def _parse_request(cls, params_schema: ma.Schema) -> PaginationParameters:
-        """TODO
+        """Parse pagination parameters from request.
+
+        Parsed parameters are stored per schema in :data:`flask.g` - nested handlers
+        retrieve them without parsing the request again.
 
         Args:
-            params_schema:
+            params_schema: Schema to parse pagination parameters.
 
         Returns:
-
+            Parsed pagination parameters.
         """
 
-        return cast(
-            PaginationParameters,
-            KeySetPaginationMixin.KEYSET_PAGINATION_PARSER.parse(
+        parsed = g.setdefault("_ivis_pagination_params", {})
+        parameters = parsed.get(params_schema)
+        if parameters is None:
+            parameters = KeySetPaginationMixin.KEYSET_PAGINATION_PARSER.parse(
                 params_schema, request, location="query"
-            ),
-        )
+            )
+            parsed[params_schema] = parameters
+        return cast(PaginationParameters, parameters)
 
     @classmethod
     def _add_api_doc(
@@ -335,7 +624,8 @@ class KeySetPaginationMixin:
 
         # Add pagination params to doc info in wrapper object
         # pylint: disable=protected-access
-        apidoc = deepcopy(getattr(wrapper, "_apidoc", {}))
+        # shallow copy is sufficient - only the top-level "pagination" key is replaced
+        apidoc = dict(getattr(wrapper, "_apidoc", {}))
         apidoc["pagination"] = {
             "parameters": {
                 "in": "query",
@@ -370,14 +660,18 @@ class KeySetPaginationMixin:
             Paginated date.
         """
 
-        parameters_schema = pager.create_schema()
+        parameters_schema = pager.get_schema()
 
-        def decorator(func: Callable[[Any], Any]) -> Callable[[Any], Any]:
-            @wraps(func)
+        def decorator(view_func: Callable[[Any], Any]) -> Callable[[Any], Any]:
+            @wraps(view_func)
             def wrapper(*args: Any, **kwargs: Any) -> Any:
                 parameters = self._parse_request(parameters_schema)
 
-                obj, status, headers = unpack_tuple_response(func(*args, **kwargs))
+                ret = view_func(*args, **kwargs)
+                if not isinstance(ret, tuple):
+                    return pager.paginated_result(ret, parameters)
+
+                obj, status, headers = unpack_tuple_response(ret)
                 paginated_result = pager.paginated_result(obj, parameters)
                 return paginated_result, status, headers
 
@@ -1,7 +1,10 @@
 """Manages config and meta info.
 """
 
-from typing import Any, Mapping, MutableMapping, Optional, Sequence
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping, MutableMapping, Optional, Sequence
 from flask import Flask, current_app, Config
 
 _flask_config = Config(root_path="")
@@ -23,11 +26,19 @@ class MissingConfig(Exception):
 
 class MissingVariable(Exception):
     def __init__(self, variable: str):
-        Exception.__init__(self)
         self.variable = variable
+        self._msg = f"Missing variable: {variable}"
+        Exception.__init__(self, self._msg)
 
     def __str__(self) -> str:
-        return f"Missing variable: {self.variable}"
+        return self._msg
+
+
+#: Shared empty mapping for plugins without variables
+_NO_VARIABLES: Mapping[str, Any] = MappingProxyType({})
+
+#: Valid combinations of variable type and whether a plugin name is provided
+_VALID_VTYPES = frozenset((("core", False), ("plugin", True)))
 
 
 class ConfigMeta:
@@ -36,10 +47,24 @@ class ConfigMeta:
     def __init__(self) -> None:
         self._name2var: MutableMapping[str, Any] = {}
         self._pname2vars: MutableMapping[str, MutableMapping[str, Any]] = {}
+        # partitioned by plugin name (None for core variables) at registration
+        self._defaults: MutableMapping[Optional[str], MutableMapping[str, Any]] = {}
+        self._required: MutableMapping[Optional[str], MutableMapping[str, None]] = {}
+        # cached variable names - reset on registration
+        self._core_vars: Optional[Sequence[str]] = None
+        self._plugin_vars: Optional[Sequence[str]] = None
+        # read-only views
+        self._name2var_view = MappingProxyType(self._name2var)
+        self._pname2vars_view: Optional[Mapping[str, Mapping[str, Any]]] = None
 
     def clear(self) -> None:
         self._name2var.clear()
         self._pname2vars.clear()
+        self._defaults.clear()
+        self._required.clear()
+        self._core_vars = None
+        self._plugin_vars = None
+        self._pname2vars_view = None
 
     # pylint: disable=too-many-arguments
     def register_variable(
@@ -52,6 +77,9 @@ class ConfigMeta:
     ) -> str:
         """Register meta info for a variable.
 
+        Validates ``vtype`` and ``pname`` - prefer :method:`register_core_variable` or
+        :method:`register_plugin_variable` that are valid by construction.
+
         Args:
             name: Name of the variable.
             vtype: Type of variable. Allowed values: "core" or "plugin".
@@ -65,19 +93,49 @@ class ConfigMeta:
         Raises:
             ValueError if wrong vtype and pname.
         """
-        if vtype not in ("core", "plugin"):
-            raise ValueError
-        if vtype == "core" and pname is not None:
-            raise ValueError
-        if vtype == "plugin" and pname is None:
+        if (vtype, pname is not None) not in _VALID_VTYPES:
             raise ValueError
 
+        return self._register(
+            name=name, vtype=vtype, required=required, pname=pname, default=default
+        )
+
+    # pylint: disable=too-many-arguments
+    def _register(
+            self,
+            name: str,
+            vtype: str,
+            required: bool,
+            pname: Optional[str],
+            default: Optional[Any],
+    ) -> str:
+        """Register meta info for a variable without validation."""
+
+        if pname:
+            pname = sys.intern(pname)
         var = variable_name(pname=pname, name=name)
         meta = {"type": vtype, "required": required, "pname": pname, "default": default}
         # store
         self._name2var[var] = meta
         if pname:
-            self._pname2vars.setdefault(pname, {})[var] = meta
+            pvars = self._pname2vars.get(pname)
+            if pvars is None:
+                pvars = self._pname2vars[pname] = {}
+                self._pname2vars_view = None
+            pvars[var] = meta
+        defaults = self._defaults.get(pname)
+        if defaults is None:
+            defaults = self._defaults[pname] = {}
+        defaults[var] = default
+        required_vars = self._required.get(pname)
+        if required_vars is None:
+            required_vars = self._required[pname] = {}
+        if required:
+            required_vars[var] = None
+        else:
+            required_vars.pop(var, None)
+        self._core_vars = None
+        self._plugin_vars = None
         return var
 
     def register_core_variable(
@@ -85,10 +143,10 @@ class ConfigMeta:
     ) -> str:
         """Register meta info for a general purpose variable.
 
-        .. seealso:: :method:`ConfigMeta._register_var`
+        .. seealso:: :method:`ConfigMeta.register_variable`
         """
-        return self.register_variable(
-            name=name, vtype="core", required=required, default=default
+        return self._register(
+            name=name, vtype="core", required=required, pname=None, default=default
         )
 
     def register_plugin_variable(
@@ -100,37 +158,50 @@ class ConfigMeta:
     ) -> str:
         """Register meta info for a plugin specific variable.
 
-        .. seealso:: :method:`ConfigMeta._register_var`
+        .. seealso:: :method:`ConfigMeta.register_variable`
         .. seealso:: TODO reference show all variables
         """
 
-        return self.register_variable(
+        return self._register(
             name=name, vtype="plugin", required=required, pname=pname, default=default
         )
 
     @property
     def plugin_vars(self) -> Sequence[str]:
-        return tuple(
-            var_name
-            for variables in self._pname2vars.values()
-            for var_name in variables
-        )
+        if self._plugin_vars is None:
+            self._plugin_vars = tuple(
+                var_name
+                for variables in self._pname2vars.values()
+                for var_name in variables
+            )
+        return self._plugin_vars
 
     @property
     def core_vars(self) -> Sequence[str]:
-        return tuple(
-            var_name for var_name, meta in self._name2var.items() if not meta["pname"]
-        )
+        if self._core_vars is None:
+            self._core_vars = tuple(
+                var_name
+                for var_name, meta in self._name2var.items()
+                if not meta["pname"]
+            )
+        return self._core_vars
 
     @property
     def name2var(self) -> Mapping[str, Any]:
-        """Variable name to variable mapping."""
-        return dict(self._name2var)
+        """Variable name to variable mapping (read-only view)."""
+        return self._name2var_view
 
     @property
     def pname2vars(self) -> Mapping[str, Mapping[str, Any]]:
-        """Plugin name to variables mapping."""
-        return dict(self._pname2vars)
+        """Plugin name to variables mapping (read-only view)."""
+        if self._pname2vars_view is None:
+            self._pname2vars_view = MappingProxyType(
+                {
+                    pname: MappingProxyType(variables)
+                    for pname, variables in self._pname2vars.items()
+                }
+            )
+        return self._pname2vars_view
 
     def set_defaults(self) -> None:
         """Set default values for core and plugin specific variables."""
@@ -139,10 +210,7 @@ class ConfigMeta:
 
     def set_core_defaults(self) -> None:
         """Set default values for core variables."""
-        for var_name in self.core_vars:
-            meta = self._name2var[var_name]
-            if "default" in meta and var_name not in current_app.config:
-                current_app.config[var_name] = meta["default"]
+        _set_defaults(self._defaults.get(None, _NO_VARIABLES))
 
     def set_plugin_defaults(self, pnames: Optional[Sequence[str]] = None) -> None:
         """Set default values for plugin specific variables.
@@ -150,12 +218,8 @@ class ConfigMeta:
         Args:
             pnames: Plugin names. Default: None
         """
-        if pnames is None:
-            pnames = list(self._pname2vars.keys())
-        for pname in pnames:
-            for var_name, meta in self._pname2vars.get(pname, {}).items():
-                if "default" in meta and var_name not in current_app.config:
-                    current_app.config[var_name] = meta["default"]
+        for pname in self._pname2vars if pnames is None else pnames:
+            _set_defaults(self._defaults.get(pname, _NO_VARIABLES))
 
     def check_config(self) -> None:
         """Check if all required variables are set."""
@@ -168,9 +232,7 @@ class ConfigMeta:
         Raises:
             :class:`MissingVariable`
         """
-        for var_name, meta in self._name2var.items():
-            if meta["pname"] is None:
-                _check_meta(var_name, meta)
+        _check_required(self._required.get(None, _NO_VARIABLES))
 
     def check_plugin_config(self, pnames: Optional[Sequence[str]] = None) -> None:
         """Check if plugin specific required variables are set.
@@ -181,20 +243,34 @@ class ConfigMeta:
         Raises:
             :class:`MissingVariable`
         """
-        if pnames is None:
-            pnames = list(self._pname2vars.keys())
-        for pname in pnames:
-            for var_name, meta in self._pname2vars.get(pname, {}).items():
-                _check_meta(var_name, meta)
+        for pname in self._pname2vars if pnames is None else pnames:
+            _check_required(self._required.get(pname, _NO_VARIABLES))
+
+
+def _set_defaults(defaults: Mapping[str, Any]) -> None:
+    config = current_app.config
+    missing = {
+        var_name: default
+        for var_name, default in defaults.items()
+        if var_name not in config
+    }
+    if missing:
+        config.update(missing)
+
+
+def _check_required(var_names: Iterable[str]) -> None:
+    config = current_app.config
+    for var_name in var_names:
+        if config.get(var_name) is None:
+            raise MissingVariable(var_name)
 
 
 def _check_meta(var_name: str, meta: Mapping[str, Any]) -> None:
-    if meta["required"] and (
-            var_name not in current_app.config or current_app.config[var_name] is None
-    ):
-        raise MissingVariable(var_name)
+    if meta["required"]:
+        _check_required((var_name,))
 
 
+@lru_cache(maxsize=None)
 def variable_name(name: str, pname: Optional[str] = None) -> str:
     """Format variable name.
 
@@ -203,13 +279,13 @@ def variable_name(name: str, pname: Optional[str] = None) -> str:
         pname: Plugin name. Default: None
 
     Returns:
-        Formatted variable name.
+        Formatted (interned) variable name.
     """
 
     if pname and not pname.startswith("i-vis-"):
-        return f"I_VIS_{pname}_{name}".upper()
+        return sys.intern(f"I_VIS_{pname}_{name}".upper())
 
-    return f"I_VIS_{name}".upper()
+    return sys.intern(f"I_VIS_{name}".upper())
 
 
 def add_i_vis(name: str, value: Any) -> None:
@@ -217,11 +293,11 @@ def add_i_vis(name: str, value: Any) -> None:
 
 
 def get_ivis(name: str, default: Optional[Any] = None) -> Any:
-    return get_config().get(variable_name(name), default)
+    return _flask_config.get(variable_name(name), default)
 
 
 def require_ivis(name: str) -> Any:
-    return get_config()[variable_name(name)]
+    return _flask_config[variable_name(name)]
 
 
 def init_app(app: Flask) -> None:
@@ -230,4 +306,5 @@ def init_app(app: Flask) -> None:
 
 
 def get_config() -> Mapping[str, Any]:
+    """Snapshot of config."""
     return dict(_flask_config)
@@ -1,11 +1,15 @@
 """Database configuration and access
 """
 
+from typing import Any, Mapping, MutableMapping, Optional
+
 from flask import Config as FlaskConfig
 from sqlalchemy import MetaData
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import UnboundExecutionError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.orm import Session, sessionmaker, scoped_session
 
 from .config import variable_name
 
@@ -21,16 +25,86 @@ convention = {
 }
 metadata = MetaData(naming_convention=convention)
 
-# extract config from flask
+#: Default size of connection pool - overwrite with I_VIS_DB_POOL_SIZE
+POOL_SIZE = 10
+#: Default number of connections beyond pool size - overwrite with I_VIS_DB_MAX_OVERFLOW
+MAX_OVERFLOW = 20
+#: Default seconds after which a connection is recycled - overwrite with I_VIS_DB_POOL_RECYCLE
+POOL_RECYCLE = 1800
+
+
+def engine_options(config: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Create engine options for a config.
+
+    Pool size and overflow are only set for dialects that use a queue pool (not SQLite).
+
+    Args:
+        config: Config with "SQLALCHEMY_DATABASE_URI" and optional pool variables.
+
+    Returns:
+        Keyword arguments for :func:`sqlalchemy.create_engine`.
+    """
+
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    options: MutableMapping[str, Any] = {
+        "url": url,
+        "max_identifier_length": 64,
+        "pool_pre_ping": True,
+        "pool_recycle": config.get(variable_name("DB_POOL_RECYCLE"), POOL_RECYCLE),
+    }
+    if url.get_backend_name() != "sqlite":
+        options["pool_size"] = config.get(variable_name("DB_POOL_SIZE"), POOL_SIZE)
+        options["max_overflow"] = config.get(
+            variable_name("DB_MAX_OVERFLOW"), MAX_OVERFLOW
+        )
+    return options
+
+
 _I_VIS_CONF = variable_name("CONF")
-_flask_config = FlaskConfig(__file__)
-_flask_config.from_envvar(_I_VIS_CONF)
-engine = create_engine(
-    url=_flask_config["SQLALCHEMY_DATABASE_URI"],
-    max_identifier_length=64,
-)
+
+#: Engine - created on first use by :func:`get_engine`
+_engine: Optional[Engine] = None
 
 
-session = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+def get_engine() -> Engine:
+    """Get engine.
+
+    The config is loaded from the file referenced by I_VIS_CONF and the engine is created on first call -
+    importing this module does not touch the database.
+
+    Returns:
+        Shared engine.
+    """
+
+    global _engine  # pylint: disable=global-statement
+    if _engine is None:
+        # extract config from flask
+        flask_config = FlaskConfig(__file__)
+        flask_config.from_envvar(_I_VIS_CONF)
+        _engine = create_engine(**engine_options(flask_config))
+    return _engine
+
+
+def __getattr__(name: str) -> Any:
+    # keep "from .db import engine" working - creates engine on first access
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _LazySession(Session):
+    """Session that binds to :func:`get_engine` on first use."""
+
+    def get_bind(self, *args: Any, **kwargs: Any) -> Any:
+        # fall back to the shared engine only if no other bind applies
+        try:
+            return super().get_bind(*args, **kwargs)
+        except UnboundExecutionError:
+            return get_engine()
+
+
+session = scoped_session(
+    sessionmaker(class_=_LazySession, autocommit=False, autoflush=False)
+)
 Base = declarative_base(metadata=metadata)
 Base.query = session.query_property()
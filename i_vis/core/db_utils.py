@@ -3,26 +3,42 @@ Utility functions for database(s) """
 
 import sys
 import warnings
+from functools import lru_cache
 from os.path import basename
-from typing import Any, Sequence, Type
+from typing import Any, MutableMapping, Optional, Sequence, Set, Type, TYPE_CHECKING
+from weakref import WeakKeyDictionary
 
 from inflection import underscore
-from sqlalchemy import inspect, Column
+from sqlalchemy import inspect, select, Column
 from sqlalchemy.sql import func
 
-from .db import engine, metadata, session
+from .db import Base, get_engine, metadata, session
+
+if TYPE_CHECKING:
+    from sqlalchemy import Table
+    from sqlalchemy.sql import Select
 
 PREFIX = "i_vis"
 
+#: Index of table name to model - rebuild on miss
+_TNAME2MODEL: MutableMapping[str, Type[Any]] = {}
+
+#: Cached count statements per table name
+_COUNT_STMTS: MutableMapping[str, "Select"] = {}
+
+#: Cached column names per mixin - entries vanish with their class
+_COLUMN_NAMES: MutableMapping[Type[Any], Sequence[str]] = WeakKeyDictionary()
+
 
 def i_vis_col(col: str) -> str:
-    return "_".join([PREFIX, col])
+    return f"{PREFIX}_{col}"
 
 # TODO remove
 #def i_vis_cols(cols: Sequence[str]) -> Sequence[str]:
 #    return tuple(i_vis_col(col) for col in cols)
 
 
+@lru_cache(maxsize=1024)
 def fname2tname(fname: str) -> str:
     """Transform fname to tname.
 
@@ -35,14 +51,9 @@ def fname2tname(fname: str) -> str:
         Transformed table name.
 
     """
-    # remove path
-    fname = basename(fname)
-    # remove suffix
-    pos = fname.find(".")
-    if pos >= 0:
-        fname = fname[0:pos]
-    tname = underscore(fname)
-    return tname
+    # remove path and suffix
+    fname, _, _ = basename(fname).partition(".")
+    return str(underscore(fname))
 
 
 def column_names(mixin: Type[Any]) -> Sequence[str]:
@@ -58,16 +69,69 @@ def column_names(mixin: Type[Any]) -> Sequence[str]:
     Returns:
         Sequence of column names contained in ``mixin``.
     """
+    try:
+        return _COLUMN_NAMES[mixin]
+    except KeyError:
+        pass
+
     # catch warnings otherwise sqlalchemy will complain
     # that a columns in a mixin are not mapped yet to table
     with warnings.catch_warnings():
         if not sys.warnoptions:
             warnings.simplefilter("ignore")
-        return tuple(
+        names = tuple(
             var.name if var.name else name
             for name, var in vars(mixin).items()
             if isinstance(var, Column)
         )
+    _COLUMN_NAMES[mixin] = names
+    return names
+
+
+def _rebuild_tname_index() -> None:
+    _TNAME2MODEL.clear()
+    for mapper in Base.registry.mappers:
+        model = mapper.class_
+        tname = getattr(model, "__tablename__", None)
+        if tname is not None:
+            _TNAME2MODEL[tname] = model
+
+
+def get_model(tname: str) -> Type[Any]:
+    """Get model for table name.
+
+    Args:
+        tname: Table name of model.
+
+    Returns:
+        Model that is mapped to ``tname``.
+
+    Raises:
+        KeyError if no model exists for ``tname``.
+    """
+
+    try:
+        return _TNAME2MODEL[tname]
+    except KeyError:
+        # models might have been registered after last rebuild
+        _rebuild_tname_index()
+        return _TNAME2MODEL[tname]
+
+
+def get_table(tname: str) -> "Table":
+    """Get table for table name.
+
+    Args:
+        tname: Table name.
+
+    Returns:
+        Table identified by ``tname``.
+
+    Raises:
+        KeyError if no table exists for ``tname``.
+    """
+
+    return metadata.tables[tname]
 
 
 def row_count(tname: str) -> int:
@@ -80,24 +144,31 @@ def row_count(tname: str) -> int:
         The number of rows for a table.
     """
 
-    table = metadata.tables[tname]
-    pks = tuple(pk for pk in table.primary_key.columns)
-    return int(session.query(func.count(*pks)).scalar())
+    try:
+        stmt = _COUNT_STMTS[tname]
+    except KeyError:
+        stmt = select(func.count()).select_from(metadata.tables[tname])
+        _COUNT_STMTS[tname] = stmt
+    return int(session.execute(stmt).scalar_one())
     # apparently slower: return model.query.count()
 
 
 def get_column_name(column: Column[Any]) -> str:
-    with warnings.catch_warnings():
-        return str(getattr(column, "name"))
+    return str(column.name)
 
 
 def missing_tables() -> Sequence[str]:
-    obj = inspect(engine)
-    return [
-        table.name
-        for table in metadata.sorted_tables
-        if not obj.dialect.has_table(engine.connect(), table.name)
-    ]
+    # retrieve existing tables once per schema - instead of one connection per table
+    inspector = inspect(get_engine())
+    existing: MutableMapping[Optional[str], Set[str]] = {}
+    missing = []
+    # order is irrelevant - skip topological sort of sorted_tables
+    for table in metadata.tables.values():
+        if table.schema not in existing:
+            existing[table.schema] = set(inspector.get_table_names(schema=table.schema))
+        if table.name not in existing[table.schema]:
+            missing.append(table.name)
+    return missing
 
 
 def tables_exist() -> bool:
@@ -4,18 +4,29 @@ import datetime
 import hashlib
 import logging
 import os
-import pathlib
 import re
-from typing import Optional
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Union
 from urllib.parse import urlparse
 
 from inflection import underscore
 
+#: Chunk size in Bytes when reading whole files (hashing, line counting)
+READ_CHUNK_SIZE = 1024 * 1024
 
+_REGEX_META = frozenset(".^$*+?{}[]|()\\")
+_SPACE_SLASH = re.compile("[ /]+")
+_NON_ALNUM = bytes(c for c in range(128) if not (chr(c).isalnum() or chr(c) in "_."))
+_WS_BEFORE_TAG = re.compile(r"\s+(?=<)")
+
+
+@lru_cache(maxsize=4096)
 def url2fname(url: str) -> str:
     """Convert URL to fname"""
-    res = urlparse(url)
-    basename = os.path.basename(res.path)
+    # URL paths are always separated by "/" - independent of os.path
+    basename = urlparse(url).path.rpartition("/")[2]
     return underscore(basename)
 
 
@@ -37,14 +48,13 @@ def prefix_fname(fname: str, pre: str, tag: Optional[str] = None) -> str:
         >>> prefix_fname("/dir/file.txt", "backup", "old")
         "/dir/backup-old-file.txt"
     """
-    dname = os.path.dirname(fname)
+    dname, fname = os.path.split(fname)
     if dname:
         dname = dname + "/"
-    fname = os.path.basename(fname).lstrip("_")
+    fname = fname.lstrip("_")
     if tag:
-        pre = f"{pre}-{tag}"
-    pre = f"{pre}-"
-    return f"{dname}{pre}{fname}"
+        return f"{dname}{pre}-{tag}-{fname}"
+    return f"{dname}{pre}-{fname}"
 
 
 def change_suffix(fname: str, new_suffix: str, old_suffix: Optional[str] = None) -> str:
@@ -68,9 +78,40 @@ def change_suffix(fname: str, new_suffix: str, old_suffix: Optional[str] = None)
     """
     if not old_suffix:
         old_suffix = os.path.splitext(fname)[1]
+    if fname.endswith(old_suffix):
+        return fname[: len(fname) - len(old_suffix)] + new_suffix
+    if _REGEX_META.isdisjoint(old_suffix):
+        return fname
     return str(re.sub(old_suffix + "$", new_suffix, fname))
 
 
+def _read_into_hash(hash_: "hashlib._Hash", file: BinaryIO) -> None:
+    buf = memoryview(bytearray(READ_CHUNK_SIZE))
+    while True:
+        n = file.readinto(buf)  # type: ignore[attr-defined]
+        if not n:
+            break
+        hash_.update(buf[:n])
+
+
+def _fadvise(fd: int, advice: str) -> None:
+    # hint kernel page cache - not available on all platforms
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+
+
+def _file_digest(fname: str, name: str) -> str:
+    with open(fname, "rb", buffering=0) as file:
+        fd = file.fileno()
+        _fadvise(fd, "POSIX_FADV_SEQUENTIAL")
+        if sys.version_info >= (3, 11):
+            return hashlib.file_digest(file, name).hexdigest()
+
+        hash_ = hashlib.new(name)
+        _read_into_hash(hash_, file)
+        return hash_.hexdigest()
+
+
 def md5(fname: str) -> str:
     """MD5 hash value for a file.
 
@@ -80,14 +121,22 @@ def md5(fname: str) -> str:
     Returns:
         MD5 hash for filename.
     """
-    md5h = hashlib.md5()
-    with open(fname, "rb") as file:
-        while True:
-            data = file.read(1024 * 64)
-            if not data:
-                break
-            md5h.update(data)
-    return md5h.hexdigest()
+    return _file_digest(fname, "md5")
+
+
+def content_hash(fname: str) -> str:
+    """Content fingerprint for a file.
+
+    Uses the cryptographic hash BLAKE2b which is faster than MD5 on 64-bit platforms.
+    Use :func:`md5` when MD5 compatible digests are required.
+
+    Args:
+        fname: File to fingerprint.
+
+    Returns:
+        Hex digest for filename.
+    """
+    return _file_digest(fname, "blake2b")
 
 
 def size(fname: str) -> int:
@@ -112,23 +161,41 @@ def lines(fname: str) -> int:
         Line count of filename.
     """
 
-    with open(fname, "rb") as file:
-        return sum(1 for _ in file)
+    count = 0
+    last = b"\n"
+    with open(fname, "rb", buffering=0) as file:
+        while True:
+            chunk = file.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            count += chunk.count(b"\n")
+            last = chunk[-1:]
+    # last line without trailing newline
+    if last != b"\n":
+        count += 1
+    return count
 
 
-def clean_fname(s: str) -> str:
-    """
+@lru_cache(maxsize=4096)
+def clean(s: str) -> str:
+    """Clean string to be used as a filename.
+
+    Leading spaces are removed, runs of spaces and slashes are replaced by "_", and
+    any character other than ASCII letters, digits, "_", and "." is dropped.
 
     Args:
-        s:
+        s: String to clean.
 
     Returns:
-
+        Cleaned string.
     """
-    s = re.sub("^ +", "", s)
-    s = re.sub("[ /]+", "_", s)
-    s = re.sub("[^0-9a-zA-Z_.]+", "", s)
-    return s
+    s = _SPACE_SLASH.sub("_", s.lstrip(" "))
+    # non-ASCII characters are dropped by encode, the remaining by translate
+    return s.encode("ascii", "ignore").translate(None, _NON_ALNUM).decode("ascii")
+
+
+#: Alias of :func:`clean`
+clean_fname = clean
 
 
 def create_dir(dname: str) -> None:
@@ -139,9 +206,11 @@ def create_dir(dname: str) -> None:
     Args:
         dname: Directory to create.
     """
-    if not os.path.exists(dname):
-        pathlib.Path(dname).mkdir(parents=True)
-        logging.debug("Created directory: %s", dname)
+    try:
+        os.makedirs(dname)
+    except FileExistsError:
+        return
+    logging.debug("Created directory: %s", dname)
 
 
 def read_query(fname: str, encoding: str = "utf8") -> str:
@@ -157,7 +226,7 @@ def read_query(fname: str, encoding: str = "utf8") -> str:
     """
     with open(fname, "r", encoding=encoding) as file:
         s = file.read()
-        return re.sub(r"\s+(?=<)", "", s)
+        return _WS_BEFORE_TAG.sub("", s)
 
 
 def modified(fname: str) -> float:
@@ -176,45 +245,154 @@ def modified_datetime(fname: str) -> datetime.datetime:
     return datetime.datetime.fromtimestamp(modified(fname))
 
 
-def path_size(path: str) -> int:
-    for root, _, files in os.walk(path):
-        return sum(os.path.getsize(os.path.join(root, file)) for file in files)
+class FileMeta(NamedTuple):
+    """Result of :func:`file_meta`."""
 
-    return 0
+    size: int
+    modified: float
 
+    @property
+    def modified_datetime(self) -> datetime.datetime:
+        return datetime.datetime.fromtimestamp(self.modified)
 
-def file_count(path: str) -> int:
-    for _, _, files in os.walk(path):
-        return len(files)
 
-    return 0
+def file_meta(fname: Union[str, "os.DirEntry[str]"]) -> FileMeta:
+    """Get size and modified time with one stat call.
+
+    Use instead of :func:`size` and :func:`modified` when both are needed.
+
+    Args:
+        fname: Filename or an entry from :func:`os.scandir` (reuses its cached stat info).
+
+    Returns:
+        Size in Bytes and modified time of filename.
+    """
+    stat = fname.stat() if isinstance(fname, os.DirEntry) else os.stat(fname)
+    return FileMeta(stat.st_size, stat.st_mtime)
+
+
+def _iter_files(path: str) -> Iterator[os.DirEntry]:  # type: ignore[type-arg]
+    """Iterate files of a directory tree.
+
+    Uses :func:`os.scandir` - file type and stat info are cached by the returned entries.
+
+    Args:
+        path: Directory to scan.
+
+    Yields:
+        Entries of files below ``path``.
+    """
+
+    stack = [path]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_file():
+                    yield entry
+                elif entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+
+
+def path_size(path: str) -> int:
+    return sum(entry.stat().st_size for entry in _iter_files(path))
+
+
+def file_count(path: str) -> int:
+    return sum(1 for _ in _iter_files(path))
 
 
 def latest_modified_datetime(path: str) -> datetime.datetime:
-    for root, _, files in os.walk(path):
-        latest_ = max(modified(os.path.join(root, file)) for file in files)
-        return datetime.datetime.fromtimestamp(latest_)
+    latest_ = max(entry.stat().st_mtime for entry in _iter_files(path))
+    return datetime.datetime.fromtimestamp(latest_)
 
-    raise ValueError
+
+def _combined_md5(fnames: List[str], max_workers: Optional[int] = None) -> str:
+    fnames.sort()
+    md5h = hashlib.md5()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for digest in executor.map(md5, fnames):
+            md5h.update(digest.encode())
+    return md5h.hexdigest()
 
 
 def path_md5(path: str) -> str:
-    """MD5 hash value for a file.
+    """MD5 hash value for a directory tree.
+
+    Hashes the content of all files in :func:`os.walk` order - compatible with
+    stored digests. Use :func:`path_digest` for faster, parallel hashing.
 
     Args:
-        fname: File to calculate MD5.
+        path: Directory to calculate MD5.
 
     Returns:
-        MD5 hash for filename.
+        MD5 hash for path.
     """
 
     md5h = hashlib.md5()
-    for _, _, fnames in os.walk(path):
+    for dname, _, fnames in os.walk(path):
         for fname in fnames:
-            with open(os.path.join(path, fname), "rb") as file:
-                while True:
-                    data = file.read(1024 * 64)
-                    if not data:
-                        break
-                    md5h.update(data)
+            with open(os.path.join(dname, fname), "rb", buffering=0) as file:
+                _read_into_hash(md5h, file)
     return md5h.hexdigest()
+
+
+def path_digest(path: str, max_workers: Optional[int] = None) -> str:
+    """MD5 based digest for a directory tree.
+
+    Files are hashed in parallel, their digests are combined in sorted path order.
+    The result is NOT compatible with :func:`path_md5`.
+
+    Args:
+        path: Directory to calculate digest.
+        max_workers: (Optional). Number of hashing threads. Default = None.
+
+    Returns:
+        Digest for path.
+    """
+
+    return _combined_md5([entry.path for entry in _iter_files(path)], max_workers)
+
+
+class PathSummary(NamedTuple):
+    """Result of :func:`walk_summary`."""
+
+    #: Digest of :func:`path_digest`
+    md5: str
+    size: int
+    file_count: int
+    latest_modified: Optional[datetime.datetime]
+
+
+def walk_summary(path: str, max_workers: Optional[int] = None) -> PathSummary:
+    """Summarize a directory tree in one traversal.
+
+    Combines :func:`path_digest`, :func:`path_size`, :func:`file_count` and
+    :func:`latest_modified_datetime` - each file is stat'ed and read once.
+
+    Args:
+        path: Directory to summarize.
+        max_workers: (Optional). Number of hashing threads. Default = None.
+
+    Returns:
+        Digest, size in Bytes, file count and latest modification (None for no files).
+    """
+
+    fnames = []
+    size_ = 0
+    latest_ = None
+    for entry in _iter_files(path):
+        stat = entry.stat()
+        size_ += stat.st_size
+        if latest_ is None or stat.st_mtime > latest_:
+            latest_ = stat.st_mtime
+        fnames.append(entry.path)
+    return PathSummary(
+        _combined_md5(fnames, max_workers),
+        size_,
+        len(fnames),
+        datetime.datetime.fromtimestamp(latest_) if latest_ is not None else None,
+    )
@@ -2,11 +2,32 @@
 User core models and functions.
 """
 
-from typing import Any, cast, Callable, Optional, Union
+from typing import (
+    Any,
+    cast,
+    Callable,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 from secrets import token_urlsafe
 
+from flask import g, has_app_context
 from flask_login.mixins import UserMixin
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, PickleType, TIMESTAMP
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    Boolean,
+    PickleType,
+    TIMESTAMP,
+    inspect,
+    or_,
+)
 from sqlalchemy.engine.default import DefaultExecutionContext
 from sqlalchemy.sql import func
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
@@ -15,21 +36,44 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from .constants import API_TOKEN_LENGTH
 from .db import Base, session
 
+#: Method to hash passwords with - salted and iterated
+PASSWORD_METHOD = "pbkdf2:sha256"
+
+#: Attempts to create an unused API token
+TOKEN_ATTEMPTS = 4
+
+
+def _request_cache() -> Optional[MutableMapping[Any, Any]]:
+    if not has_app_context():
+        return None
+    return cast(MutableMapping[Any, Any], g.setdefault("_ivis_model_cache", {}))
+
 
 def load_user(user_id: int) -> Optional["User"]:
     """Load user.
 
+    Called by flask-login for every request - memoized for the current request.
+
     Args:
         user_id: User to load.
 
     Returns:
         User identified with ``user_id``.
     """
-    user = User.query.get(int(user_id))
-    if user:
-        return cast(User, user)
+    user_id = int(user_id)
+    cache = _request_cache()
+    key = (User, "id", user_id)
+    if cache is not None:
+        user = cache.get(key)
+        if user is not None and inspect(user).persistent:
+            return cast(User, user)
 
-    return None
+    user = session.get(User, user_id)
+    if not user:
+        return None
+    if cache is not None:
+        cache[key] = user
+    return user
 
 
 #  replace any with column type
@@ -55,12 +99,19 @@ def wrap_func(
 
 
 def create_token() -> str:
-    for _ in range(1, 5):
-        token = token_urlsafe(API_TOKEN_LENGTH)
-        user = User.load_by_token(token)
-        if not user:
-            return token[:API_TOKEN_LENGTH]
-    raise Exception()
+    """Create unused API token.
+
+    Concurrent users can still pick the same token - the unique constraint of
+    :attr:`User.token` rejects the second insert.
+
+    Raises:
+        RuntimeError if no unused token was found within :data:`TOKEN_ATTEMPTS`.
+    """
+    for _ in range(TOKEN_ATTEMPTS):
+        token = token_urlsafe(API_TOKEN_LENGTH)[:API_TOKEN_LENGTH]
+        if session.query(User.id).filter_by(token=token).first() is None:
+            return token
+    raise RuntimeError("Could not create unused API token")
 
 
 class User(Base, UserMixin):
@@ -90,38 +141,73 @@ class User(Base, UserMixin):
     def set_password(self, password: str) -> None:
         """Hash and set password."""
 
-        self.password = generate_password_hash(password, method="sha256")
+        self.password = generate_password_hash(password, method=PASSWORD_METHOD)
 
     def check_password(self, password: str) -> bool:
-        """Check hashed password."""
+        """Check hashed password.
+
+        Valid passwords hashed with another method are rehashed with
+        :data:`PASSWORD_METHOD` - the caller has to commit the session.
+        """
 
         assert self.password is not None
-        return check_password_hash(self.password, password)
+        if not check_password_hash(self.password, password):
+            return False
+        if not self.password.startswith(PASSWORD_METHOD + ":"):
+            self.set_password(password)
+        return True
+
+    @classmethod
+    def _load_by(cls, column: str, value: Any) -> Optional["User"]:
+        """Load User by column value - memoized for the current request.
+
+        Only found users are memoized and reused while they are still persistent and
+        match ``value``.
+        """
+        cache = _request_cache()
+        key = (cls, column, value)
+        if cache is not None:
+            user = cache.get(key)
+            if (
+                user is not None
+                and inspect(user).persistent
+                and getattr(user, column) == value
+            ):
+                return cast(User, user)
+
+        user = cls.query.filter_by(**{column: value}).first()
+        if not user:
+            return None
+        if cache is not None:
+            cache[key] = user
+        return cast(User, user)
 
     @classmethod
     def load_by_name(cls, name: str) -> Optional["User"]:
         """Load User by name."""
-        user = cls.query.filter_by(name=name).first()
-        if user:
-            return cast(User, user)
-
-        return None
+        return cls._load_by("name", name)
 
     @classmethod
     def load_by_mail(cls, mail: str) -> Optional["User"]:
         """Load User by mail."""
-        user = cls.query.filter_by(mail=mail).first()
-        if user:
-            return cast(User, user)
+        return cls._load_by("mail", mail)
 
-        return None
+    @classmethod
+    def load_by_name_or_mail(cls, name: str, mail: str) -> Sequence[Tuple[str, str]]:
+        """Load name and mail of users with name or mail - in one query.
+
+        Returns:
+            Tuples of (name, mail).
+        """
+        return tuple(
+            session.query(cls.name, cls.mail).filter(
+                or_(cls.name == name, cls.mail == mail)
+            )
+        )
 
     @classmethod
     def load_by_token(cls, token: str) -> Optional["User"]:
-        user = cls.query.filter_by(token=token).first()
-        if not user:
-            return None
-        return cast("User", user)
+        return cls._load_by("token", token)
 
     __mapper_args = {
         "always_refresh": True,
@@ -148,12 +234,31 @@ class Setting(Base):
 
     @classmethod
     def set_value(cls, variable: str, value: Any) -> "Setting":
+        """Set value of a setting.
+
+        A new setting is added to the session - changes are pending until the session
+        is flushed.
+        """
         setting = session.query(cls).get(variable)
         if setting is None:
-            setting = Setting(variable=variable, value=value)
+            setting = cls(variable=variable, value=value)
+            session.add(setting)
         else:
             setting.value = value
-        return cast(Setting, setting)
+        return setting
+
+    @classmethod
+    def get_values(cls) -> Mapping[str, Any]:
+        """Get all settings ordered by variable.
+
+        Pending changes, e.g. of :meth:`set_value`, are flushed first - the session
+        does not autoflush.
+
+        Returns:
+            Mapping of variable to value.
+        """
+        session.flush()
+        return dict(session.query(cls.variable, cls.value).order_by(cls.variable).all())
 
 
 class UserSchema(SQLAlchemyAutoSchema):
@@ -2,18 +2,37 @@
 API specific methods.
 """
 
+from functools import lru_cache
 from typing import Any, MutableMapping, Tuple
 
 import hgvs.parser
-from flask import Blueprint, jsonify, request, Response
+from flask import Blueprint, current_app, json, jsonify, request, Response
+from flask.blueprints import BlueprintSetupState
+from flask_login import current_user
 from flask_login.utils import login_required
 from hgvs.enums import ValidationLevel
 from sqlalchemy import desc
 
-from ..utils import _AUTOCOMPLETE, _DATATABLE
+from ..db import session
+from ..utils import _AUTOCOMPLETE, _DATATABLE, datatable_page
 
 bp = Blueprint("api", __name__, url_prefix="/api")
 
+#: Maximal number of suggestions returned by autocomplete
+AUTOCOMPLETE_LIMIT = 20
+
+
+def _json_response(data: Any) -> Response:
+    """Serialize large payloads compactly.
+
+    Unlike :func:`flask.jsonify` - never pretty-printed and non-ASCII characters are
+    not escaped.
+    """
+    return current_app.response_class(
+        json.dumps(data, separators=(",", ":"), ensure_ascii=False),
+        mimetype="application/json",
+    )
+
 
 # TODO api description
 # add swagger description here
@@ -32,15 +51,22 @@ def autocomplete(model_name: str, column: str) -> Response:
     model_meta = _AUTOCOMPLETE.get(model_name)
     if model_meta is None:
         return jsonify(response)
-    cols = model_meta["cols"]
-    if column not in cols or model_meta["cols"]():
+    # check permission before touching the DB
+    callback = model_meta.cols.get(column)
+    if callback is None or not callback(current_user):
         return jsonify(response)
-    model = model_meta["model"]
+    model = model_meta.model
 
     attr = getattr(model, column)
-    results = model.query.filter(attr.contains(query))
-    response["found"] = tuple(getattr(result, column) for result in results)
-    return jsonify(response)
+    results = (
+        session.query(attr)
+        .filter(attr.contains(query))
+        .distinct()
+        .order_by(attr)
+        .limit(AUTOCOMPLETE_LIMIT)
+    )
+    response["found"] = tuple(value for value, in results)
+    return _json_response(response)
 
 
 # TODO-report
@@ -50,13 +76,14 @@ def datatable(query_name: str) -> Tuple[Response, int]:
     query_meta = _DATATABLE.get(query_name)
     if query_meta is None:
         return jsonify({"error": "Unknown query."}), 405
-    if not query_meta["callback"]():
+    if query_meta.callback is not None and not query_meta.callback():
         return jsonify({"error": "Permission denied."}), 403
 
-    model = query_meta["model"]
+    model = query_meta.model
     query = model.query
-    total = query.count()
-    schema = query_meta["schema"]
+    load_options = query_meta.query_options()
+    if load_options:
+        query = query.options(*load_options)
 
     values = request.json
     if values and "columns" in values:
@@ -79,23 +106,35 @@ def datatable(query_name: str) -> Tuple[Response, int]:
             if attrs:
                 query = query.order_by(*attrs)
 
-        if "start" in values and "length" in values:
-            start = values.get("start", 0)
-            length = values.get("length", 100)
-            query = query.limit(length).offset(start)
+    try:
+        start, length = datatable_page(values)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    query = query.limit(length).offset(start)
 
-    query_desc = query_meta["query_desc"]()
-    formatters = {
-        col_desc["db"]["data"]: col_desc["db"]["formatter"]
+    query_desc = query_meta.query_desc()
+    formatters = tuple(
+        (col_desc["db"]["data"], col_desc["db"]["formatter"])
         for col_desc in query_desc
         if "db" in col_desc and "formatter" in col_desc["db"]
-    }
+    )
+    # bulk formatters map all dumped rows of the page to the values of one column
+    bulk_formatters = tuple(
+        (col_desc["db"]["data"], col_desc["db"]["bulk_formatter"])
+        for col_desc in query_desc
+        if "db" in col_desc and "bulk_formatter" in col_desc["db"]
+    )
+    # separate COUNT - window functions are not supported by all DB servers
+    total = model.query.count()
     result = query.all()
-    data = schema.dump(result, many=True)
+    data = query_meta.schema.dump(result, many=True)
     if formatters:
         for row in data:
-            for col, formatter in formatters.items():
+            for col, formatter in formatters:
                 row[col] = formatter(row)
+    for col, bulk_formatter in bulk_formatters:
+        for row, value in zip(data, bulk_formatter(data)):
+            row[col] = value
 
     filtered = total
 
@@ -104,7 +143,7 @@ def datatable(query_name: str) -> Tuple[Response, int]:
         draw = int(values.get("draw", 0))
 
     return (
-        jsonify(
+        _json_response(
             {
                 "draw": draw + 1,
                 "data": data,
@@ -120,6 +159,29 @@ def datatable(query_name: str) -> Tuple[Response, int]:
 hgvs_parser = hgvs.parser.Parser()
 
 
+@bp.record_once
+def _warm_up_parser(state: BlueprintSetupState) -> None:
+    # grammar is built lazily on first parse - do it at app setup, not in a request
+    try:
+        hgvs_parser.parse("NM_000000.1:c.1A>G")
+    except Exception:  # pylint: disable=broad-except
+        state.app.logger.warning("Failed to warm up HGVS parser", exc_info=True)
+
+
+@lru_cache(maxsize=1 << 16)
+def _parse_and_validate(var: str) -> Tuple[str, Tuple[Any, ...]]:
+    """Parse and validate a HGVS variant - memoized across requests.
+
+    Returns:
+        Type of variant and validation info.
+    """
+    parsed = hgvs_parser.parse(var)
+    validation = tuple(
+        obj for obj in parsed.validate() if not isinstance(obj, ValidationLevel)
+    )
+    return parsed.type, validation
+
+
 # TODO move to api
 @bp.route("/validate-variants", methods=["GET", "POST"])
 def validate_variants() -> Tuple[Response, int]:
@@ -127,21 +189,19 @@ def validate_variants() -> Tuple[Response, int]:
     if data is None:
         return jsonify({"error": "No variants in request"}), 403
 
-    validated_vars = []
-    for var_id, var in enumerate(data.get("variants")):
-        parsed = hgvs_parser.parse(var)
-        validation = tuple(
-            obj for obj in parsed.validate() if not isinstance(obj, ValidationLevel)
-        )
-
-        validated_var = {
+    variants = data.get("variants")
+    validated_vars = [
+        {
             "id": var_id,
             "var": var,
-            "type": parsed.type,
+            "type": type_,
             "validation_info": validation,
-            "valid": len(validation) == 0,
+            "valid": not validation,
         }
-        validated_vars.append(validated_var)
+        for var_id, (var, (type_, validation)) in enumerate(
+            zip(variants, map(_parse_and_validate, variants))
+        )
+    ]
 
     response = {
         "draw": data.get("draw", 0) + 1,
@@ -149,4 +209,4 @@ def validate_variants() -> Tuple[Response, int]:
         "recordsTotal": len(validated_vars),
     }
 
-    return jsonify(response), 200
+    return _json_response(response), 200
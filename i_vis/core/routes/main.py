@@ -36,6 +36,9 @@ def signin() -> Union[str, Response]:
             flash("Invalid username or password.", category="error")
             return redirect(url_for("main.signin"))
         login_user(user, remember=form.rememberme.data)
+        # persist password rehashed by check_password
+        if session.is_modified(user):
+            session.commit()
 
         next_ = request.args.get("next")
         if not next_ or not is_safe_url(next_):
@@ -114,8 +117,7 @@ def account() -> str:
 @login_required
 def show_settings() -> str:
     settings = {
-        setting.variable: str(setting.value)
-        for setting in session.query(Setting).order_by(Setting.variable).all()
+        variable: str(value) for variable, value in Setting.get_values().items()
     }
     return render_template(
         "settings.jinja", settings=settings, current_user=current_user
@@ -2,16 +2,18 @@
 User specific routes.
 """
 
-from typing import Union
+from typing import Optional, Tuple, Union, cast
 from werkzeug.wrappers import Response
 from flask import Blueprint, render_template, redirect, url_for, flash
 from flask_login import current_user
 from flask_login.utils import login_required
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
 
 from ..db import session
 from ..errors import flash_duplicate, flash_not_found
 from ..forms import ChangeUserForm, UserForm
-from ..models import User
+from ..models import User, create_token
 from ..login import admin_required
 
 bp = Blueprint("users", __name__, url_prefix="/users")
@@ -26,6 +28,30 @@ _index_col_descs = {
 }
 
 
+def _get_user(user_id: int) -> Optional[User]:
+    """Load user with the columns shown by user views - others are loaded on access."""
+    return cast(
+        Optional[User],
+        session.query(User)
+        .options(
+            load_only(User.id, User.name, User.mail, User.is_admin, User.created_at)
+        )
+        .get(user_id),
+    )
+
+
+def _flash_taken(name: str, mail: str) -> bool:
+    """Flash an error if user name or mail is already taken."""
+    taken = User.load_by_name_or_mail(name, mail)
+    if any(name_ == name for name_, _ in taken):
+        flash_duplicate("Username", extra=" Pick something else.")
+        return True
+    if any(mail_ == mail for _, mail_ in taken):
+        flash_duplicate("E-Mail", extra=" Pick something else.")
+        return True
+    return False
+
+
 @bp.route("/index", methods=["GET", "POST"])
 @bp.route("/", methods=["GET", "POST"])
 @admin_required
@@ -41,21 +67,28 @@ def index() -> str:
 @bp.route("/add", methods=["GET", "POST"])
 @admin_required
 @login_required
-def add() -> Union[str, Response]:
+def add() -> Union[str, Tuple[str, int], Response]:
     form = UserForm()
     if form.validate_on_submit():
-        user = User.load_by_name(form.name.data)
-        if user is not None:
-            flash_duplicate("Username", extra=" Pick something else.")
-            return redirect(url_for("users.add"))
-        user = User.load_by_mail(form.mail.data)
-        if user is not None:
-            flash_duplicate("E-Mail", extra=" Pick something else.")
+        if _flash_taken(form.name.data, form.mail.data):
             return redirect(url_for("users.add"))
         user = User(name=form.name.data, mail=form.mail.data)
         user.set_password(form.password.data)
         session.add(user)
-        session.commit()
+        try:
+            session.commit()
+        except IntegrityError:
+            session.rollback()
+            # name or mail taken by a concurrent insert
+            if _flash_taken(form.name.data, form.mail.data):
+                return (
+                    render_template("users/adt.jinja", title="Add User", form=form),
+                    409,
+                )
+            # otherwise the token collided - retry once with a new token
+            user.token = create_token()
+            session.add(user)
+            session.commit()
         flash(f"User {user.name} has been created.", category="success")
         return redirect(url_for("users.show", user_id=user.name))
     return render_template("users/adt.jinja", title="Add User", form=form)
@@ -66,7 +99,7 @@ def add() -> Union[str, Response]:
 @login_required
 def show(user_id: int) -> Union[str, Response]:
     user_id = int(user_id)
-    user = User.query.get(user_id)
+    user = _get_user(user_id)
     if user is None:
         flash_not_found("User", user_id)
         return redirect(url_for("users.index"))
@@ -79,17 +112,16 @@ def show(user_id: int) -> Union[str, Response]:
 def edit(user_id: int) -> Union[str, Response]:
     form = ChangeUserForm()
     if form.validate_on_submit():
-        user = User.query.get(user_id)
+        user = _get_user(user_id)
         if user is None:
             flash_not_found("User", user_id)
             return redirect(url_for("users.index"))
         # prevent duplicates
-        tmp_user = User.load_by_name(form.name.data)
-        if tmp_user is not None and tmp_user.name != user.name:
+        taken = User.load_by_name_or_mail(form.name.data, form.mail.data)
+        if any(name == form.name.data and name != user.name for name, _ in taken):
             flash_duplicate("User", user_id)
             return redirect(url_for("users.edit"))
-        tmp_user = User.load_by_mail(form.mail.data)
-        if tmp_user is not None and tmp_user.name != user.name:
+        if any(mail == form.mail.data and name != user.name for name, mail in taken):
             flash_duplicate("E-Mail", form.mail.data)
             return redirect(url_for("users.edit"))
         user = User(name=form.name.data, mail=form.mail.data)
@@ -3,33 +3,45 @@ General utility classes and methods.
 """
 
 import logging
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import (
     Any,
     Callable,
+    FrozenSet,
     Mapping,
     MutableMapping,
     Optional,
     Sequence,
-    Set,
+    Tuple,
+    Type,
     TYPE_CHECKING,
+    cast,
 )
 from urllib.parse import urlparse, urljoin
 import re
 
 from flask import request
+from marshmallow import fields
+from sqlalchemy.orm import class_mapper, selectinload
 from tqdm import tqdm
 from requests.exceptions import RequestException
 
 if TYPE_CHECKING:
     from logging import LogRecord
-    from .db import Base
 
 
 class StatusCode200Error(RequestException):
     """Status code != 200."""
 
 
+@lru_cache(maxsize=8)
+def _netloc(url: str) -> str:
+    # host urls are stable - parse each once
+    return urlparse(url).netloc
+
+
 def is_safe_url(target: str) -> bool:
     """Check if target url is safe.
 
@@ -41,25 +53,47 @@ def is_safe_url(target: str) -> bool:
     Returns:
         True if target is safe or False otherwise.
     """
-    ref_url = urlparse(request.host_url)
-    test_url = urlparse(urljoin(request.host_url, target))
-    return test_url.scheme in ("http", "https") and ref_url.netloc == test_url.netloc
+    host_url = request.host_url
+    test_url = urlparse(urljoin(host_url, target))
+    return test_url.scheme in ("http", "https") and _netloc(host_url) == test_url.netloc
 
 
 # TODO adjust
+#: Attribute to cache the value -> member mapping of an enum
+_ENUM_BY_VALUE_ATTR = "_i_vis_by_value"
+#: Attribute to cache the values of an enum
+_ENUM_VALUES_ATTR = "_i_vis_values"
+
+
 class EnumMixin:
-    """Mixin provides convenience methods."""
+    """Mixin provides convenience methods.
+
+    Lookups are cached per enum class on first use.
+    """
+
+    @classmethod
+    def _by_value(cls) -> Mapping[str, Any]:
+        # check own __dict__ to ignore cached lookups of parent classes
+        by_value = cls.__dict__.get(_ENUM_BY_VALUE_ATTR)
+        if by_value is None:
+            by_value = {e.value: e for e in cls}  # type: ignore
+            setattr(cls, _ENUM_BY_VALUE_ATTR, by_value)
+        return cast(Mapping[str, Any], by_value)
 
     @classmethod
     def from_str(cls, s: str) -> Any:
-        for v in cls:  # type: ignore
-            if v.value == s:
-                return v
-        raise NotImplementedError
+        try:
+            return cls._by_value()[s]
+        except KeyError:
+            raise NotImplementedError from None
 
     @classmethod
-    def values(cls) -> Set[str]:
-        return {e.value for e in cls}  # type: ignore
+    def values(cls) -> FrozenSet[str]:
+        values = cls.__dict__.get(_ENUM_VALUES_ATTR)
+        if values is None:
+            values = frozenset(e.value for e in cls)  # type: ignore
+            setattr(cls, _ENUM_VALUES_ATTR, values)
+        return cast(FrozenSet[str], values)
 
 
 def format_datetime(value: datetime, format_: str) -> str:
@@ -133,45 +167,133 @@ def table_labels(column_descs: Mapping) -> Mapping:
     }
 
 
-# TODO-report what is this for? Make a class from it
-_DATATABLE = {}
+#: Maximal number of datatable rows returned - also used when no page is requested
+DATATABLE_MAX_LENGTH = 10_000
+
+
+def datatable_page(values: Optional[Mapping[str, Any]]) -> Tuple[int, int]:
+    """Get offset and limit of the requested datatable page.
+
+    Without ``start`` or ``length`` the first :data:`DATATABLE_MAX_LENGTH` rows are
+    requested. Negative ("all") and larger lengths are bounded by
+    :data:`DATATABLE_MAX_LENGTH` - a whole table is never loaded.
+
+    Args:
+        values: Parameters sent by DataTables.
+
+    Returns:
+        Start and length of the page.
+
+    Raises:
+        ValueError if start or length are not integers or start is negative.
+    """
+    values = values or {}
+    try:
+        start = int(values.get("start", 0))
+        length = int(values.get("length", DATATABLE_MAX_LENGTH))
+    except TypeError as e:
+        raise ValueError("Invalid start or length.") from e
+    if start < 0:
+        raise ValueError("Invalid start or length.")
+    if length < 0 or length > DATATABLE_MAX_LENGTH:
+        length = DATATABLE_MAX_LENGTH
+    return start, length
+
+
+@dataclass(frozen=True)
+class DatatableMeta:
+    """Registered datatable query."""
+
+    __slots__ = ("model", "schema", "query_desc", "callback", "load_options")
+
+    model: Type[Any]
+    schema: Any
+    query_desc: Callable[[], Sequence[Mapping[str, Any]]]
+    callback: Optional[Callable[[], bool]]
+    #: Explicit load options - ``None`` to derive them from nested fields of schema
+    load_options: Optional[Sequence[Any]]
+
+    def query_options(self) -> Sequence[Any]:
+        """Load options for the query - derived options are computed on first use."""
+        if self.load_options is not None:
+            return self.load_options
+        return _nested_load_options(self.model, self.schema)
+
+
+# TODO-report what is this for?
+_DATATABLE: MutableMapping[str, DatatableMeta] = {}
+
+
+#: Cached eager load options per (model, schema)
+_NESTED_LOAD_OPTIONS: MutableMapping[Tuple[Type[Any], Any], Sequence[Any]] = {}
+
+
+def _nested_load_options(model: Type[Any], schema: Any) -> Sequence[Any]:
+    """Eager load options for relationships dumped by nested fields of schema.
+
+    Cached per model and schema - mappers are only inspected once all models are
+    configured, i.e.: on the first request.
+    """
+    try:
+        return _NESTED_LOAD_OPTIONS[(model, schema)]
+    except KeyError:
+        pass
+
+    relationships = class_mapper(model).relationships
+    options = []
+    for name, field in getattr(schema, "fields", {}).items():
+        if not isinstance(field, fields.Nested):
+            continue
+        attr = field.attribute or name
+        if attr in relationships:
+            options.append(selectinload(getattr(model, attr)))
+    nested = _NESTED_LOAD_OPTIONS[(model, schema)] = tuple(options)
+    return nested
 
 
 # TODO-report
 def register_datatable_query(
     query_name: str,
-    model: "Base",
+    model: Type[Any],
     schema,
     query_desc,
     callback: Optional[Callable] = None,
+    load_options: Optional[Sequence[Any]] = None,
 ) -> None:
-    _DATATABLE[query_name] = {
-        "model": model,
-        "schema": schema,
-        "query_desc": query_desc,
-        "callback": callback,
-    }
+    _DATATABLE[query_name] = DatatableMeta(
+        model, schema, query_desc, callback, load_options
+    )
 
 
-# TODO-report map queries to callbacks. Make a class from it.
-_AUTOCOMPLETE: MutableMapping = {}
+@dataclass(frozen=True)
+class AutocompleteMeta:
+    """Registered autocomplete model - maps columns to callbacks."""
+
+    __slots__ = ("model", "cols")
+
+    model: Type[Any]
+    cols: MutableMapping[str, Callable[[Any], bool]]
+
+
+# TODO-report map queries to callbacks.
+_AUTOCOMPLETE: MutableMapping[str, AutocompleteMeta] = {}
 
 
 # TODO-report
 def register_autocomplete(
     model_name: str,
-    model: "Base",
+    model: Type[Any],
     column: str,
     callback: Optional[Callable[[Any], bool]] = None,
 ) -> None:
-    model_meta = _AUTOCOMPLETE.setdefault(model_name.title(), {})
-    if not model_meta:
-        model_meta["model"] = model
-        model_meta["cols"] = {}
+    model_name = model_name.title()
+    model_meta = _AUTOCOMPLETE.get(model_name)
+    if model_meta is None:
+        model_meta = _AUTOCOMPLETE[model_name] = AutocompleteMeta(model, {})
 
     if callback is None:
         callback = lambda x: True
-    model_meta["cols"][column] = callback
+    model_meta.cols[column] = callback
 
 
 class TqdmLoggingHandler(logging.StreamHandler):
@@ -191,8 +313,20 @@ class TqdmLoggingHandler(logging.StreamHandler):
 CLASS_NAME_REGEX = re.compile("([ _-]*)([^ _-]+)")
 
 
-def class_name(*names: str) -> str:
-    def helper(match: re.Match) -> str:
-        return str(match.group(2)[0].upper() + match.group(2)[1:])
+_CLASS_NAME_SEPARATORS = frozenset(" _-")
+
 
-    return "".join(CLASS_NAME_REGEX.sub(helper, name) for name in names)
+def _capitalize_part(match: re.Match) -> str:
+    return str(match.group(2)[0].upper() + match.group(2)[1:])
+
+
+@lru_cache(maxsize=1024)
+def _class_name_part(name: str) -> str:
+    if _CLASS_NAME_SEPARATORS.isdisjoint(name):
+        # single word - no regex needed
+        return name[:1].upper() + name[1:]
+    return CLASS_NAME_REGEX.sub(_capitalize_part, name)
+
+
+def class_name(*names: str) -> str:
+    return "".join(map(_class_name_part, names))
@@ -11,6 +11,8 @@ The following version types can be represented by implementing :class:`Version`
 Version information can be compared with:
 "<", ">", "==", ">=", and "<=".
 
+Versions are treated as immutable - parsed versions are cached and shared.
+
 Examples:
     >>> v = Default(major=1, minor=0)
     >>> w = Default(major=1, minor=1)
@@ -18,20 +20,38 @@ Examples:
     True
 """
 
-from typing import Any, Dict, MutableMapping, Optional, Sequence
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from functools import lru_cache, partial
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
 import datetime
 import re
-
-import requests
-from lxml import etree
-
-from .utils import StatusCode200Error
-
+import threading
+import warnings
 
 #: Maximum allowed version length.
 MAX_VERSION_LENGTH = 20
 #: Default date format to store version info
 DATE_FORMAT = "%Y_%m_%d"
+#: Timeout in seconds of requests to retrieve version info
+REQUEST_TIMEOUT = 100
+
+
+#: Default date format of "Last-Modified" header info
+HTTP_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
+
+
+@lru_cache(maxsize=1024)
+def _strptime(s: str, format_: str) -> datetime.datetime:
+    return datetime.datetime.strptime(s, format_)
+
+
+def _parse_date(s: str) -> datetime.date:
+    """Parse date string in :data:`DATE_FORMAT` without :func:`strptime`."""
+
+    year, month, day = s.split("_")
+    return datetime.date(int(year), int(month), int(day))
 
 
 class UnknownVersionError(Exception):
@@ -45,6 +65,8 @@ class ParseError(Exception):
 class Version:
     """Base class for version information."""
 
+    __slots__ = ()
+
     def __str__(self) -> str:
         raise NotImplementedError
 
@@ -65,6 +87,8 @@ class Version:
 class Unknown(Version):
     """Unknown version."""
 
+    __slots__ = ()
+
     def __str__(self) -> str:
         return "Unknown"
 
@@ -87,43 +111,55 @@ class Unknown(Version):
 
 
 class Date(Version):
-    """Version based on a date."""
+    """Version based on a date.
+
+    Read-only - instances are cached and shared.
+    """
+
+    __slots__ = ("_date", "_key", "_str", "_hash")
 
     def __init__(self, date: datetime.date) -> None:
-        self.date = date
+        if isinstance(date, datetime.datetime):
+            date = date.date()
+        self._date = date
+        self._key = (date.year, date.month, date.day)
+        self._str = date.strftime(DATE_FORMAT)
+        self._hash = hash(self._key)
+
+    @property
+    def date(self) -> datetime.date:
+        return self._date
 
     @property
     def year(self) -> int:
-        return self.date.year
+        return self._date.year
 
     @property
     def month(self) -> int:
-        return self.date.month
+        return self._date.month
 
     @property
     def day(self) -> int:
-        return self.date.day
+        return self._date.day
 
     def __str__(self) -> str:
-        return self.date.strftime(DATE_FORMAT)
+        return self._str
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, Date):
-            return str(self) == str(other)
+            return self._key == other._key
         return NotImplemented
 
     def __lt__(self, other: Any) -> bool:
         if isinstance(other, Date):
-            return less_than(self, other, ["year", "month", "day"])
+            return self._key < other._key
         return NotImplemented
 
     def __hash__(self) -> int:
-        return hash(self.date)
+        return self._hash
 
     def to_date(self) -> datetime.date:
-        return datetime.date(
-            year=self.date.year, month=self.date.month, day=self.date.day
-        )
+        return self._date
 
     # FIXME raise exceptions
     @staticmethod
@@ -149,31 +185,56 @@ class Date(Version):
         s = by_xpath(url, xpath)
         # connection error
         # parse error
-        date = datetime.datetime.strptime(s, format_)
+        date = _strptime(s, format_)
         # format error
         return Date(date)
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def from_str(s: str) -> "Date":
-        return Date(datetime.datetime.strptime(s, DATE_FORMAT))
+        return Date(_parse_date(s))
 
 
 class Nightly(Date):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(datetime.date.today())
 
 
 DEFAULT_PATTERN = re.compile(
-    r"(?P<prefix>.*[^\d+])?(?P<major>\d+)(\.(?P<minor>\d+))?(\.(?P<patch>\d+))?(?P<suffix>.*)"
+    r"(?P<prefix>\D*)(?P<major>\d+)(?:\.(?P<minor>\d+))?(?:\.(?P<patch>\d+))?"
+    r"(?P<suffix>.*)",
+    re.DOTALL,
 )
 
+_default_match = DEFAULT_PATTERN.fullmatch
+
 
 class Default(Version):
     """Semantic versioning.
 
     Capture format: [pre-]major.minor.patch[-suffix]
+
+    Versions are equal if major, minor, patch, prefix, and suffix are equal - a
+    missing part differs from any present part. Thus, ``Default(1, 2)`` and
+    ``Default(1, None, 2)`` are not equal although both are printed as "1.2".
+    Prefix and suffix are ignored when versions are ordered.
+
+    Read-only - instances are cached and shared.
     """
 
+    __slots__ = (
+        "_major",
+        "_minor",
+        "_patch",
+        "_prefix",
+        "_suffix",
+        "_key",
+        "_str",
+        "_hash",
+    )
+
     # pylint: disable=too-many-arguments
     def __init__(
         self,
@@ -185,15 +246,44 @@ class Default(Version):
     ) -> None:
         # TODO check types
 
-        self.major = major
-        self.minor = minor
-        self.patch = patch
-        self.prefix = prefix
-        self.suffix = suffix
+        self._major = major
+        self._minor = minor
+        self._patch = patch
+        self._prefix = prefix
+        self._suffix = suffix
+        # missing parts are older than any present part
+        self._key = (
+            major,
+            -1 if minor is None else minor,
+            -1 if patch is None else patch,
+        )
+        s = [str(v) for v in (major, minor, patch) if v is not None]
+        self._str = f'{prefix}{".".join(s)}{suffix}'
+        # same parts as __eq__
+        self._hash = hash((self._key, prefix, suffix))
+
+    @property
+    def major(self) -> int:
+        return self._major
+
+    @property
+    def minor(self) -> Optional[int]:
+        return self._minor
+
+    @property
+    def patch(self) -> Optional[int]:
+        return self._patch
+
+    @property
+    def prefix(self) -> str:
+        return self._prefix
+
+    @property
+    def suffix(self) -> str:
+        return self._suffix
 
     def __str__(self) -> str:
-        s = [str(v) for v in [self.major, self.minor, self.patch] if v is not None]
-        return f'{self.prefix}{".".join(s)}{self.suffix}'
+        return self._str
 
     def __repr__(self) -> str:
         values = tuple(
@@ -205,48 +295,83 @@ class Default(Version):
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, Default):
-            return str(self) == str(other)
+            return (
+                self._key == other._key
+                and self._prefix == other._prefix
+                and self._suffix == other._suffix
+            )
         return NotImplemented
 
     def __lt__(self, other: Any) -> bool:
         if isinstance(other, Default):
-            return less_than(self, other, ("major", "minor", "patch"))
+            return self._key < other._key
         return NotImplemented
 
     def __hash__(self) -> int:
-        return hash(tuple(v for v in (self.major, self.minor, self.patch) if v))
+        return self._hash
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def from_str(s: str) -> "Default":
-        match = re.match(DEFAULT_PATTERN, s)
+        match = _default_match(s)
         if match is None:
             raise ValueError(f"Version could not be parsed from: {s}")
 
-        matched: MutableMapping[str, Any] = {}
-        for key, value in match.groupdict().items():
-            if value is None:
-                continue
-            if key in ("major", "minor", "patch"):
-                matched[key] = int(value)
-            else:
-                matched[key] = value
-        return Default(**matched)
+        prefix, major, minor, patch, suffix = match.groups()
+        return Default(
+            int(major),
+            None if minor is None else int(minor),
+            None if patch is None else int(patch),
+            prefix,
+            suffix,
+        )
+
+
+#: Alternation of date based and semantic versions - date based is tried first
+VERSION_PATTERN = re.compile(
+    r"(?P<date>\d{4}_\d{1,2}_\d{1,2})|(?P<default>" + DEFAULT_PATTERN.pattern + ")",
+    re.DOTALL,
+)
+
+_version_match = VERSION_PATTERN.fullmatch
 
+#: name of matched group -> parser
+_FROM_STR = {
+    "date": Date.from_str,
+    "default": Default.from_str,
+}
 
-# FIMXE DateVerion parse as DefaultVersion
-# def from_str(s: str) -> "Version":
-#    for obj in (Default, Date):
-#        try:
-#            return obj.from_str(s)
-#        except ValueError:
-#            continue
-#
-#    raise ParseError(s)
+
+@lru_cache(maxsize=4096)
+def from_str(s: str) -> Version:
+    """Parse version from string.
+
+    Parsed versions are cached and shared - all version types are read-only.
+
+    Args:
+        s: Version string, e.g.: "2020_01_25" or "pre-1.2.3-post".
+
+    Returns:
+        :class:`Date`, :class:`Default`, or :class:`Unknown` if ``s`` cannot be parsed.
+    """
+
+    match = _version_match(s)
+    if match is None:
+        return Unknown()
+
+    name = match.lastgroup
+    try:
+        return _FROM_STR[name](match.group(name))  # type: ignore
+    except ValueError:
+        return Unknown()
 
 
 def less_than(self: Version, other: Version, attrs: Sequence[str]) -> bool:
     """Compare versions based on attributes.
 
+    .. deprecated::
+        Versions are ordered by ``<`` - this function is no longer used.
+
     ``self`` and ``other`` be the same type.
 
     Args:
@@ -258,6 +383,11 @@ def less_than(self: Version, other: Version, attrs: Sequence[str]) -> bool:
         True, if ``self`` is older than ``other``. False, otherwise.
     """
 
+    warnings.warn(
+        "less_than is deprecated - compare versions with '<'",
+        DeprecationWarning,
+        stacklevel=2,
+    )
     for attr in attrs:
         attr1 = getattr(self, attr, None)
         attr2 = getattr(other, attr, None)
@@ -275,12 +405,96 @@ def less_than(self: Version, other: Version, attrs: Sequence[str]) -> bool:
     return False
 
 
-def by_xpath(url: str, xpath: str, **kwargs: Any) -> str:
+#: Per thread sessions - :class:`requests.Session` is not thread-safe
+_LOCAL = threading.local()
+
+
+def _shared_session() -> Any:
+    """Session of the current thread - pools connections and retries transient errors.
+
+    :module:`requests` is imported on first use to keep importing this module cheap.
+    """
+
+    session = getattr(_LOCAL, "session", None)
+    if session is not None:
+        return session
+
+    # pylint: disable=import-outside-toplevel
+    import requests
+    from requests.adapters import HTTPAdapter, Retry
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    _LOCAL.session = session
+    return session
+
+
+#: Maximum number of pages cached by :func:`by_xpath` - least recently used are evicted
+MAX_CACHED_PAGES = 64
+
+#: url -> (conditional request headers, body) of pages fetched by :func:`by_xpath`
+_CACHED_PAGES: "OrderedDict[str, Tuple[Mapping[str, str], str]]" = OrderedDict()
+_CACHED_PAGES_LOCK = threading.Lock()
+
+
+def _get_text(url: str, session: Optional[Any] = None, **kwargs: Any) -> str:
+    """GET body of url - a previously fetched body is revalidated conditionally.
+
+    Raises:
+        StatusCode200Error if ``url`` does not respond with status code 200 or 304.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from .utils import StatusCode200Error
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    with _CACHED_PAGES_LOCK:
+        cached = _CACHED_PAGES.get(url)
+        if cached is not None:
+            _CACHED_PAGES.move_to_end(url)
+    if cached is not None:
+        headers.update(cached[0])
+
+    r = (session or _shared_session()).get(
+        url, timeout=REQUEST_TIMEOUT, headers=headers, **kwargs
+    )
+    if r.status_code == 304 and cached is not None:
+        return cached[1]
+    if r.status_code != 200:
+        raise StatusCode200Error(response=r)
+
+    validators = {}
+    if "ETag" in r.headers:
+        validators["If-None-Match"] = r.headers["ETag"]
+    if "Last-Modified" in r.headers:
+        validators["If-Modified-Since"] = r.headers["Last-Modified"]
+    if validators:
+        with _CACHED_PAGES_LOCK:
+            _CACHED_PAGES[url] = (validators, r.text)
+            _CACHED_PAGES.move_to_end(url)
+            while len(_CACHED_PAGES) > MAX_CACHED_PAGES:
+                _CACHED_PAGES.popitem(last=False)
+    return str(r.text)
+
+
+def by_xpath(url: str, xpath: str, session: Optional[Any] = None, **kwargs: Any) -> str:
     """Retrieve version string from url using xpath.
 
+    Up to :data:`MAX_CACHED_PAGES` pages are cached per process and revalidated with
+    a conditional GET (ETag/Last-Modified) - an unchanged page is not downloaded again.
+
     Args:
         url: Url to retrieve version string from.
         xpath: XPATH of version string.
+        session: (Optional) :class:`requests.Session` to use. Default: shared session.
         kwargs: Arguments forwarded to :module:`requests`.
 
     Returns:
@@ -290,41 +504,80 @@ def by_xpath(url: str, xpath: str, **kwargs: Any) -> str:
         ValueError if cannot connect to ``url``.
     """
 
-    r = requests.get(url, timeout=100, **kwargs)
-    if r.status_code != 200:
-        raise StatusCode200Error(reponse=r)
+    # pylint: disable=import-outside-toplevel
+    from lxml import etree
 
+    text = _get_text(url, session, **kwargs)
     parser = etree.HTMLParser()
-    tree = etree.fromstring(r.text, parser=parser)  # type: ignore
+    tree = etree.fromstring(text, parser=parser)  # type: ignore
     return str(tree.xpath(xpath).pop().text)  # type: ignore
 
 
 def last_modified(
     url: str,
     request_args: Optional[Dict[str, Any]] = None,
-    date_format: str = "%a, %d %b %Y %H:%M:%S GMT",
+    date_format: str = HTTP_DATE_FORMAT,
+    session: Optional[Any] = None,
 ) -> Optional[datetime.date]:
     """Retrieve last modified from header of url.
 
     Args:
         url: Url to check header info.
         request_args: (Optional) Arguments forwarded to :module:`requests`.
-        date_format: Expected data format in header info. Default: "%a, %d %b %Y %H:%M:%S GMT".
+        date_format: Expected data format in header info.
+            Default: :data:`HTTP_DATE_FORMAT`.
+        session: (Optional) :class:`requests.Session` to use. Default: shared session.
 
     Returns:
-        Last modification datetime for ``url`` or None.
+        Last modification datetime for ``url`` or None, if it is not available or
+        a header in the default format cannot be parsed.
     """
 
     if not request_args:
         request_args = {}
-    r = requests.head(url, timeout=100, **request_args)
+    r = (session or _shared_session()).head(
+        url, timeout=REQUEST_TIMEOUT, **request_args
+    )
     if r.status_code != 200:
         return None
+    headers = r.headers
 
     key = "Last-Modified"
-    if key not in r.headers:
+    if key not in headers:
         return None
-    return datetime.datetime.strptime(r.headers[key], date_format)
+    if date_format == HTTP_DATE_FORMAT:
+        # python < 3.10 raises TypeError on malformed dates
+        try:
+            modified = parsedate_to_datetime(headers[key])
+        except (TypeError, ValueError):
+            return None
+        return modified.replace(tzinfo=None)
+    return _strptime(headers[key], date_format)
+
+
+def last_modified_all(
+    urls: Sequence[str], max_workers: int = 16, **kwargs: Any
+) -> Dict[str, Optional[datetime.date]]:
+    """Retrieve last modified from headers of several urls concurrently.
+
+    Args:
+        urls: Urls to check header info.
+        max_workers: Maximum number of concurrent requests.
+        **kwargs: see :func:`last_modified` for details.
+
+    Each worker thread uses its own session. A ``session`` given in ``kwargs`` is
+    not shared between threads - the urls are then checked one after another.
+
+    Returns:
+        Mapping of url to last modification datetime or None.
+    """
+
+    if kwargs.get("session") is not None:
+        return {url: last_modified(url, **kwargs) for url in urls}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        dates = executor.map(partial(last_modified, **kwargs), urls)
+        return dict(zip(urls, dates))
 
 
 def recent(*dates: datetime.date) -> datetime.date:
@@ -337,4 +590,4 @@ def recent(*dates: datetime.date) -> datetime.date:
         Most recent date from ``*dates``.
     """
 
-    return max(*dates)
+    return max(dates)
@@ -6,6 +6,7 @@ import pytest
 from flask import Flask
 
 from i_vis.core.config import ConfigMeta
+from i_vis.core.version import Unknown
 
 if TYPE_CHECKING:
     from i_vis.core.db import db as db_
@@ -22,6 +23,11 @@ def fast_config() -> Type[FastConfig]:
     return FastConfig
 
 
+@pytest.fixture(scope="session")
+def unknown_version() -> Unknown:
+    return Unknown()
+
+
 @pytest.fixture
 def config_meta() -> ConfigMeta:
     return ConfigMeta()
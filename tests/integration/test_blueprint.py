@@ -37,16 +37,15 @@ class TestQueryPager:
     @pytest.mark.parametrize(
         "current_id,size,expected",
         [
-            (1, 2, [1, 2]),
-            (2, 2, [2, 3]),
-            (4, 2, [4, 5]),
-            (6, 2, [6, 7]),
-            (8, 2, [8, 9]),
-            (10, 2, [10]),
-            (1, 5, [1, 2, 3, 4, 5]),
-            (5, 5, [5, 6, 7, 8, 9]),
-            (10, 5, [10]),
-            (11, 5, []),
+            (0, 2, [1, 2]),
+            (2, 2, [3, 4]),
+            (4, 2, [5, 6]),
+            (6, 2, [7, 8]),
+            (8, 2, [9, 10]),
+            (10, 2, []),
+            (0, 5, [1, 2, 3, 4, 5]),
+            (5, 5, [6, 7, 8, 9, 10]),
+            (10, 5, []),
         ],
     )
     # pylint: disable=unused-argument
@@ -58,7 +57,7 @@ class TestQueryPager:
         size: int,
         expected: Sequence[Any],
     ) -> None:
-        query_wrapper = bp.QueryWrapper(User.id, User.query)
+        query_wrapper = bp.QueryWrapper((User.id,), User.query, {}, str)
         results = query_pager.paginated_result(
             query_wrapper,
             bp.PaginationParameters(current_id=current_id, size=size),
@@ -1,22 +1,14 @@
 # pylint: disable=redefined-outer-name
-from typing import Any, Optional, Sequence
+from typing import Any, Optional, Sequence, Tuple
 
 import pytest
-from _pytest.fixtures import SubRequest
+from marshmallow import ValidationError
+from sqlalchemy import Column, Integer
+from werkzeug.exceptions import HTTPException
 
 from i_vis.core import blueprint as bp
 
 
-@pytest.fixture
-def pagination_params(request: SubRequest) -> bp.PaginationParameters:
-    return bp.PaginationParameters(*request.param)
-
-
-@pytest.fixture
-def pager_info(request: SubRequest) -> bp.PagerInfo:
-    return bp.PagerInfo(*request.param)
-
-
 def test_pagination_parameters() -> None:
     pagination_params = bp.PaginationParameters(1, 2)
     assert pagination_params.current_id == 1
@@ -25,7 +17,7 @@ def test_pagination_parameters() -> None:
 
 class TestPagerInfo:
     @pytest.mark.parametrize(
-        "pagination_params,total,expected",
+        "pagination_args,total,expected",
         [
             ((1, 1), None, None),
             ((1, 1), 10, 10),
@@ -33,14 +25,14 @@ class TestPagerInfo:
             ((6, 3), 10, 4),
             ((10, 5), 10, 2),
         ],
-        indirect=("pagination_params",),
     )
     def test_pages(
         self,
-        pagination_params: bp.PaginationParameters,
+        pagination_args: Tuple[int, int],
         total: Optional[int],
         expected: int,
     ) -> None:
+        pagination_params = bp.PaginationParameters(*pagination_args)
         pager_info = bp.PagerInfo(pagination_params, total)
         assert pager_info.pages == expected
 
@@ -63,12 +55,12 @@ def test_next_id(
     assert bp.get_next_id(current_id, size, total) == expected
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def list_obj() -> Sequence[int]:
-    return [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+    return tuple(range(1, 11))
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def list_pager() -> bp.ListPager:
     return bp.ListPager()
 
@@ -77,15 +69,15 @@ class TestListPager:
     @pytest.mark.parametrize(
         "current_id,size,expected",
         [
-            (0, 2, [1, 2]),
-            (2, 2, [3, 4]),
-            (4, 2, [5, 6]),
-            (6, 2, [7, 8]),
-            (8, 2, [9, 10]),
-            (10, 2, []),
-            (0, 5, [1, 2, 3, 4, 5]),
-            (5, 5, [6, 7, 8, 9, 10]),
-            (10, 5, []),
+            (0, 2, (1, 2)),
+            (2, 2, (3, 4)),
+            (4, 2, (5, 6)),
+            (6, 2, (7, 8)),
+            (8, 2, (9, 10)),
+            (10, 2, ()),
+            (0, 5, (1, 2, 3, 4, 5)),
+            (5, 5, (6, 7, 8, 9, 10)),
+            (10, 5, ()),
         ],
     )
     def test_paginated_results(
@@ -103,3 +95,43 @@ class TestListPager:
             ).results
             == expected
         )
+
+
+@pytest.mark.parametrize("key", [1, (1, "a")])
+def test_key_cursor(key: bp.Key) -> None:
+    assert bp.decode_key(bp.encode_key(key)) == key
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "invalid",
+        bp.encode_cursor({"k": 1}),
+        bp.encode_cursor({"k": "1", "v": bp.CURSOR_VERSION}),
+        bp.encode_cursor({"k": True, "v": bp.CURSOR_VERSION}),
+        bp.encode_cursor({"k": [], "v": bp.CURSOR_VERSION}),
+        bp.encode_cursor({"k": [1, {"a": 1}], "v": bp.CURSOR_VERSION}),
+    ],
+)
+def test_decode_key_fails(token: str) -> None:
+    with pytest.raises(ValidationError):
+        bp.decode_key(token)
+
+
+def test_keyset_filter_arity() -> None:
+    with pytest.raises(ValidationError):
+        bp.keyset_filter((Column("a", Integer),), (1, 2))
+
+
+@pytest.mark.parametrize("next_id", [None, 2])
+def test_create_links_copies(next_id: Optional[bp.Key]) -> None:
+    links = {"self": "/items"}
+    page_links = bp.create_links(links, lambda cursor: cursor, next_id)
+    assert page_links is not links
+    assert links == {"self": "/items"}
+
+
+@pytest.mark.parametrize("current_id", [-1, (1, 2)])
+def test_index_key_fails(current_id: bp.Key) -> None:
+    with pytest.raises(HTTPException):
+        bp.index_key(current_id)
@@ -3,9 +3,9 @@
 from typing import Any, Type
 
 import pytest
+from sqlalchemy import Column, String
 
 from i_vis.core import db_utils
-from i_vis.core.db import db
 
 
 @pytest.mark.parametrize(
@@ -19,14 +19,15 @@ def test_fname2tname(fname: str, expected: str) -> None:
     assert db_utils.fname2tname(fname) == expected
 
 
-@pytest.fixture
-def mini_mixin() -> Type[Any]:
-    class Mixin1:
-        pk = db.Column(db.String(30), primary_key=True)
-        name = db.Column(db.String(30))
-        type = db.Column(db.String(30), name="core")
-        n = 10
+class Mixin1:
+    pk = Column(String(30), primary_key=True)
+    name = Column(String(30))
+    type = Column(String(30), name="core")
+    n = 10
+
 
+@pytest.fixture(scope="session")
+def mini_mixin() -> Type[Any]:
     return Mixin1
 
 
@@ -1,6 +1,8 @@
 # pylint: disable=redefined-outer-name
 
+import hashlib
 import os
+import pathlib
 
 import pytest
 
@@ -48,22 +50,71 @@ def test_change_suffix(
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mini_file() -> str:
     current_dir = os.path.dirname(os.path.abspath(__file__))
     return os.path.join(current_dir, "static", "10-lines.txt")
 
 
-def test_md5(mini_file: str) -> None:
+@pytest.fixture(scope="module")
+def mini_file_bytes(mini_file: str) -> bytes:
+    with open(mini_file, "rb") as file:
+        return file.read()
+
+
+def test_md5(mini_file: str, mini_file_bytes: bytes) -> None:
     assert file_utils.md5(mini_file) == "fc69a359565f35bf130a127ae2ebf2da"
+    assert file_utils.md5(mini_file) == hashlib.md5(mini_file_bytes).hexdigest()
+
+
+def test_content_hash(mini_file: str, mini_file_bytes: bytes) -> None:
+    expected = hashlib.blake2b(mini_file_bytes).hexdigest()
+    assert file_utils.content_hash(mini_file) == expected
 
 
-def test_size(mini_file: str) -> None:
+def test_size(mini_file: str, mini_file_bytes: bytes) -> None:
     assert file_utils.size(mini_file) == 20
+    assert file_utils.size(mini_file) == len(mini_file_bytes)
 
 
-def test_lines(mini_file: str) -> None:
+def test_file_meta(mini_file: str) -> None:
+    meta = file_utils.file_meta(mini_file)
+    assert meta.size == file_utils.size(mini_file)
+    assert meta.modified == file_utils.modified(mini_file)
+
+
+def test_lines(mini_file: str, mini_file_bytes: bytes) -> None:
     assert file_utils.lines(mini_file) == 10
+    assert file_utils.lines(mini_file) == len(mini_file_bytes.splitlines())
+
+
+@pytest.fixture
+def mini_tree(tmp_path: pathlib.Path) -> str:
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.txt").write_bytes(b"a\nb\n")
+    (tmp_path / "sub" / "b.txt").write_bytes(b"ccc\n")
+    return str(tmp_path)
+
+
+def test_path_size(mini_tree: str) -> None:
+    assert file_utils.path_size(mini_tree) == 8
+
+
+def test_file_count(mini_tree: str) -> None:
+    assert file_utils.file_count(mini_tree) == 2
+
+
+def test_path_md5(tmp_path: pathlib.Path) -> None:
+    (tmp_path / "a.txt").write_bytes(b"a\nb\n")
+    assert file_utils.path_md5(str(tmp_path)) == hashlib.md5(b"a\nb\n").hexdigest()
+
+
+def test_walk_summary(mini_tree: str) -> None:
+    summary = file_utils.walk_summary(mini_tree)
+    assert summary.md5 == file_utils.path_digest(mini_tree)
+    assert summary.size == file_utils.path_size(mini_tree)
+    assert summary.file_count == file_utils.file_count(mini_tree)
+    assert summary.latest_modified == file_utils.latest_modified_datetime(mini_tree)
 
 
 @pytest.mark.parametrize(
@@ -1,30 +1,46 @@
 # pylint: disable=redefined-outer-name
 
-from typing import Sequence
+from functools import lru_cache
+from typing import Any, Callable, Dict, Sequence, Tuple
+from unittest import mock
 import datetime
 
 import pytest
-from _pytest.fixtures import SubRequest
 
 from i_vis.core import version
 
 
-@pytest.fixture
-def unknown_version() -> version.Unknown:
-    return version.Unknown()
+def _param_id(value: Any) -> str:
+    # cheap test ids - the Version base class has no string representation
+    if type(value) is version.Version:  # pylint: disable=unidiomatic-typecheck
+        return "Version"
+    if isinstance(value, dict):
+        return ",".join(f"{k}={v}" for k, v in value.items())
+    return str(value)
+
+
+# shared instances - two distinct Unknown versions to compare
+_UNKNOWN1 = version.Unknown()
+_UNKNOWN2 = version.Unknown()
+_VERSION = version.Version()
 
 
 class TestUnknown:
     def test_str(self, unknown_version: version.Unknown) -> None:
         assert str(unknown_version) == "Unknown"
 
+    def test_hash(self, unknown_version: version.Unknown) -> None:
+        assert hash(unknown_version) == 0
+        assert len({unknown_version, version.Unknown()}) == 2
+
     @pytest.mark.parametrize(
         "version1,version2,expected",
         [
-            (version.Unknown(), version.Unknown(), False),
-            (version.Unknown(), version.Version(), False),
-            (version.Version(), version.Unknown(), False),
+            (_UNKNOWN1, _UNKNOWN2, False),
+            (_UNKNOWN1, _VERSION, False),
+            (_VERSION, _UNKNOWN1, False),
         ],
+        ids=_param_id,
     )
     def test_eq(
         self, version1: version.Version, version2: version.Version, expected: bool
@@ -32,7 +48,9 @@ class TestUnknown:
         assert (version1 == version2) == expected
 
     @pytest.mark.parametrize(
-        "unknown_version1,unknown_version2", [(version.Unknown(), version.Unknown())]
+        "unknown_version1,unknown_version2",
+        [(_UNKNOWN1, _UNKNOWN2)],
+        ids=_param_id,
     )
     def test_lt(
         self, unknown_version1: version.Unknown, unknown_version2: version.Unknown
@@ -40,7 +58,9 @@ class TestUnknown:
         assert not unknown_version1 < unknown_version2
 
     @pytest.mark.parametrize(
-        "unknown_version1,unknown_version2", [(version.Unknown(), version.Unknown())]
+        "unknown_version1,unknown_version2",
+        [(_UNKNOWN1, _UNKNOWN2)],
+        ids=_param_id,
     )
     def test_gt(
         self, unknown_version1: version.Unknown, unknown_version2: version.Unknown
@@ -48,278 +68,188 @@ class TestUnknown:
         assert not unknown_version1 > unknown_version2
 
 
+@lru_cache(maxsize=None)
 def create_date_version(s: str) -> version.Date:
-    return version.Date(datetime.date.fromisoformat(s))
+    # e.g.: "2020-06-02"
+    return version.Date(datetime.date(int(s[:4]), int(s[5:7]), int(s[8:10])))
 
 
-@pytest.fixture
-def date_version(request: SubRequest) -> version.Date:
-    # e.g.: "2020-6-2"
-    return create_date_version(request.param)
+_DATE_EQ_CASES = (
+    ("2020-06-02", "2020-06-02", True),
+    ("2020-06-01", "2020-06-02", False),
+    ("2020-07-02", "2020-06-02", False),
+    ("2021-06-02", "2020-06-02", False),
+)
+
+_DATE_LT_CASES = (
+    ("2020-06-02", "2020-06-02", False),
+    ("2020-06-01", "2020-06-02", True),
+    ("2020-06-02", "2020-07-02", True),
+    ("2020-06-02", "2021-06-02", True),
+    ("2020-06-02", "2020-06-01", False),
+    ("2020-07-02", "2020-06-02", False),
+    ("2021-06-02", "2020-06-02", False),
+)
 
 
 class TestDate:
     @pytest.mark.parametrize(
-        "date_version,expected",
+        "date_str,expected",
         [
-            ("2020-06-02", 2020),
-            ("2000-07-03", 2000),
+            ("2020-06-02", (2020, 6, 2)),
+            ("2000-07-03", (2000, 7, 3)),
         ],
-        indirect=["date_version"],
     )
-    def test_year(self, date_version: version.Date, expected: int) -> None:
-        assert date_version.year == expected
+    def test_year_month_day(self, date_str: str, expected: Tuple[int, ...]) -> None:
+        date_version = create_date_version(date_str)
+        assert (date_version.year, date_version.month, date_version.day) == expected
 
     @pytest.mark.parametrize(
-        "date_version,expected",
+        "date_str,expected",
         [
-            ("2020-06-02", 6),
-            ("2000-07-03", 7),
+            ("2020-06-02", "2020_06_02"),
+            ("2000-07-03", "2000_07_03"),
         ],
-        indirect=["date_version"],
     )
-    def test_month(self, date_version: version.Date, expected: int) -> None:
-        assert date_version.month == expected
+    def test_str(self, date_str: str, expected: str) -> None:
+        date_version = create_date_version(date_str)
+        assert str(date_version) == expected
 
-    @pytest.mark.parametrize(
-        "date_version,expected",
-        [
-            ("2020-06-02", 2),
-            ("2000-07-03", 3),
-        ],
-        indirect=["date_version"],
-    )
-    def test_day(self, date_version: version.Date, expected: int) -> None:
-        assert date_version.day == expected
+    def test_read_only(self) -> None:
+        date_version = version.Date.from_str("2020_06_02")
+        with pytest.raises(AttributeError):
+            date_version.date = datetime.date(2000, 1, 1)  # type: ignore[misc]
 
     @pytest.mark.parametrize(
-        "date_version,expected",
-        [
-            ("2020-06-02", "2020/06/02"),
-            ("2000-07-03", "2020/07/03"),
-        ],
-        indirect=["date_version"],
+        "date_str1,date_str2,expected",
+        _DATE_EQ_CASES,
+        ids=[f"{a}=={b}" for a, b, _ in _DATE_EQ_CASES],
     )
-    def test_str(self, date_version: version.Date, expected: str) -> None:
-        assert str(date_version), expected
-
-    @pytest.mark.parametrize(
-        "date_version1,date_version2, expected",
-        [
-            (
-                create_date_version("2020-06-02"),
-                create_date_version("2020-06-02"),
-                True,
-            ),
-            (
-                create_date_version("2020-06-01"),
-                create_date_version("2020-06-02"),
-                False,
-            ),
-            (
-                create_date_version("2020-07-02"),
-                create_date_version("2020-06-02"),
-                False,
-            ),
-            (
-                create_date_version("2021-06-02"),
-                create_date_version("2020-06-02"),
-                False,
-            ),
-        ],
-    )
-    def test_eq(
-        self, date_version1: version.Date, date_version2: version.Date, expected: bool
-    ) -> None:
+    def test_eq(self, date_str1: str, date_str2: str, expected: bool) -> None:
+        date_version1 = create_date_version(date_str1)
+        date_version2 = create_date_version(date_str2)
         assert (date_version1 == date_version2) == expected
 
     @pytest.mark.parametrize(
-        "date_version1,date_version2, expected",
-        [
-            (
-                create_date_version("2020-06-02"),
-                create_date_version("2020-06-02"),
-                False,
-            ),
-            (
-                create_date_version("2020-06-01"),
-                create_date_version("2020-06-02"),
-                True,
-            ),
-            (
-                create_date_version("2020-06-02"),
-                create_date_version("2020-07-02"),
-                True,
-            ),
-            (
-                create_date_version("2020-06-02"),
-                create_date_version("2021-06-02"),
-                True,
-            ),
-            (
-                create_date_version("2020-06-02"),
-                create_date_version("2020-06-01"),
-                False,
-            ),
-            (
-                create_date_version("2020-07-02"),
-                create_date_version("2020-06-02"),
-                False,
-            ),
-            (
-                create_date_version("2021-06-02"),
-                create_date_version("2020-06-02"),
-                False,
-            ),
-        ],
+        "date_str1,date_str2,expected",
+        _DATE_LT_CASES,
+        ids=[f"{a}<{b}" for a, b, _ in _DATE_LT_CASES],
     )
-    def test_lt(
-        self, date_version1: version.Date, date_version2: version.Date, expected: bool
-    ) -> None:
+    def test_lt(self, date_str1: str, date_str2: str, expected: bool) -> None:
+        date_version1 = create_date_version(date_str1)
+        date_version2 = create_date_version(date_str2)
         assert (date_version1 < date_version2) == expected
 
     @pytest.mark.parametrize(
-        "date_version, expected",
+        "date_str, expected",
         [
-            ("2020-05-01", datetime.date(year=2020, month=5, day=1)),
-            ("2021-06-02", datetime.date(year=2021, month=6, day=2)),
+            pytest.param("2020-05-01", datetime.date(2020, 5, 1), id="2020-05-01"),
+            pytest.param("2021-06-02", datetime.date(2021, 6, 2), id="2021-06-02"),
         ],
-        indirect=["date_version"],
     )
-    def test_to_date(self, date_version: version.Date, expected: datetime.date) -> None:
+    def test_to_date(self, date_str: str, expected: datetime.date) -> None:
+        date_version = create_date_version(date_str)
         assert date_version.to_date() == expected
 
     @pytest.mark.parametrize(
         "s, expected",
         [
-            ("2020_05_01", create_date_version("2020-05-01")),
-            ("2021_06_02", create_date_version("2021-06-02")),
+            pytest.param(
+                "2020_05_01", create_date_version("2020-05-01"), id="2020_05_01"
+            ),
+            pytest.param(
+                "2021_06_02", create_date_version("2021-06-02"), id="2021_06_02"
+            ),
         ],
     )
     def test_from_str(self, s: str, expected: version.Date) -> None:
         assert version.Date.from_str(s) == expected
 
 
-@pytest.fixture
-def default_version(request: SubRequest) -> version.Default:
-    return version.Default(**request.param)
+# shared Default kwargs - versions are built in the test bodies
+_V123 = dict(major=1, minor=2, patch=3)
+_V123_STAGING = dict(_V123, prefix="test-", suffix="-staging")
+
+_DEFAULT_EQ_CASES = (
+    (dict(major=1), dict(major=1), True),
+    (_V123, _V123, True),
+    (_V123_STAGING, _V123_STAGING, True),
+    (_V123, dict(major=1, minor=1, patch=3), False),
+    (_V123, dict(major=1, minor=2, patch=2), False),
+    (_V123, dict(major=2, minor=2, patch=3), False),
+    (dict(major=1, minor=2, patch=3, suffix="-stagging"), _V123, False),
+)
+
+_DEFAULT_LT_CASES = (
+    (dict(major=1, prefix="testing", suffix="alpha"), dict(major=1), False),
+    (dict(major=1, minor=0), dict(major=1, minor=0), False),
+    (dict(major=1, minor=0, patch=1), dict(major=1, minor=0, patch=1), False),
+    (dict(major=1, minor=0, patch=1), dict(major=1, minor=1, patch=1), True),
+    (dict(major=1, minor=1, patch=1), dict(major=1, minor=1, patch=2), True),
+    (dict(major=1, minor=1), dict(major=1, minor=1, patch=1), True),
+)
 
 
 class TestDefault:
     @pytest.mark.parametrize(
-        "default_version,expected",
+        "kwargs,expected",
         [
-            (version.Default(major=1), "1"),
-            (version.Default(major=1, minor=2, patch=3), "1.2.3"),
-            (
-                version.Default(
-                    major=1, minor=2, patch=3, prefix="test-", suffix="-staging"
-                ),
-                "test-1.2.3-staging",
-            ),
+            (dict(major=1), "1"),
+            (_V123, "1.2.3"),
+            (_V123_STAGING, "test-1.2.3-staging"),
         ],
     )
-    def test_str(self, default_version: version.Date, expected: str) -> None:
-        assert str(default_version) == expected
+    def test_str(self, kwargs: Dict[str, Any], expected: str) -> None:
+        assert str(version.Default(**kwargs)) == expected
+
+    @pytest.mark.parametrize("attr", ["major", "minor", "patch", "prefix", "suffix"])
+    def test_read_only(self, attr: str) -> None:
+        default_version = version.Default.from_str("1.2.3")
+        with pytest.raises(AttributeError):
+            setattr(default_version, attr, 3)
+        assert version.Default.from_str("1.2.3") == version.Default(1, 2, 3)
 
     @pytest.mark.parametrize(
-        "default_version1,default_version2,expected",
-        [
-            (version.Default(major=1), version.Default(major=1), True),
-            (
-                version.Default(major=1, minor=2, patch=3),
-                version.Default(major=1, minor=2, patch=3),
-                True,
-            ),
-            (
-                version.Default(
-                    major=1, minor=2, patch=3, prefix="test-", suffix="-staging"
-                ),
-                version.Default(
-                    major=1, minor=2, patch=3, prefix="test-", suffix="-staging"
-                ),
-                True,
-            ),
-            (
-                version.Default(major=1, minor=2, patch=3),
-                version.Default(major=1, minor=1, patch=3),
-                False,
-            ),
-            (
-                version.Default(major=1, minor=2, patch=3),
-                version.Default(major=1, minor=2, patch=2),
-                False,
-            ),
-            (
-                version.Default(major=1, minor=2, patch=3),
-                version.Default(major=2, minor=2, patch=3),
-                False,
-            ),
-            (
-                version.Default(major=1, minor=2, patch=3, suffix="-stagging"),
-                version.Default(major=1, minor=2, patch=3),
-                False,
-            ),
-        ],
+        "kwargs1,kwargs2,expected",
+        _DEFAULT_EQ_CASES,
+        ids=_param_id,
     )
     def test_eq(
         self,
-        default_version1: version.Date,
-        default_version2: version.Date,
+        kwargs1: Dict[str, Any],
+        kwargs2: Dict[str, Any],
         expected: bool,
     ) -> None:
+        default_version1 = version.Default(**kwargs1)
+        default_version2 = version.Default(**kwargs2)
         assert (default_version1 == default_version2) == expected
 
     @pytest.mark.parametrize(
-        "default_version1,default_version2, expected",
-        [
-            (
-                version.Default(major=1, prefix="testing", suffix="alpha"),
-                version.Default(major=1),
-                False,
-            ),
-            (
-                version.Default(major=1, minor=0),
-                version.Default(major=1, minor=0),
-                False,
-            ),
-            (
-                version.Default(major=1, minor=0, patch=1),
-                version.Default(major=1, minor=0, patch=1),
-                False,
-            ),
-            (
-                version.Default(major=1, minor=0, patch=1),
-                version.Default(major=1, minor=1, patch=1),
-                True,
-            ),
-            (
-                version.Default(major=1, minor=1, patch=1),
-                version.Default(major=1, minor=1, patch=2),
-                True,
-            ),
-            (
-                version.Default(major=1, minor=1),
-                version.Default(major=1, minor=1, patch=1),
-                True,
-            ),
-        ],
+        "kwargs1,kwargs2, expected",
+        _DEFAULT_LT_CASES,
+        ids=_param_id,
     )
     def test_lt(
         self,
-        default_version1: version.Default,
-        default_version2: version.Default,
+        kwargs1: Dict[str, Any],
+        kwargs2: Dict[str, Any],
         expected: bool,
     ) -> None:
+        default_version1 = version.Default(**kwargs1)
+        default_version2 = version.Default(**kwargs2)
         assert (default_version1 < default_version2) == expected
 
     @pytest.mark.parametrize(
         "s,expected",
         [
-            ("pre-1.1.2-post", version.Default(1, 1, 2, prefix="pre-", suffix="-post")),
-            ("1.1.2", version.Default(1, 1, 2)),
-            ("1.1", version.Default(1, 1)),
-            ("1", version.Default(1)),
+            pytest.param(
+                "pre-1.1.2-post",
+                version.Default(1, 1, 2, prefix="pre-", suffix="-post"),
+                id="pre-1.1.2-post",
+            ),
+            pytest.param("1.1.2", version.Default(1, 1, 2), id="1.1.2"),
+            pytest.param("1.1", version.Default(1, 1), id="1.1"),
+            pytest.param("1", version.Default(1), id="1"),
         ],
     )
     def test_from_str(self, s: str, expected: version.Default) -> None:
@@ -329,42 +259,114 @@ class TestDefault:
 @pytest.mark.parametrize(
     "s,expected",
     [
-        ("1.1.1", version.Default(1, 1, 1)),
-        ("1.0.0", version.Default(1, 0, 0)),
-        ("1.1", version.Default(1)),
-        ("1", version.Default(1)),
-        ("2020_01_25", version.Date(datetime.date(year=2020, month=1, day=25))),
-        ("4.1a", version.Default(major=1, minor=1, suffix="a")),
+        ("1.1.1", lambda: version.Default(1, 1, 1)),
+        ("1.0.0", lambda: version.Default(1, 0, 0)),
+        ("1.1", lambda: version.Default(1, 1)),
+        ("1", lambda: version.Default(1)),
+        ("2020_01_25", lambda: version.Date(datetime.date(2020, 1, 25))),
+        ("4.1a", lambda: version.Default(major=4, minor=1, suffix="a")),
     ],
+    ids=["1.1.1", "1.0.0", "1.1", "1", "2020_01_25", "4.1a"],
 )
-def test_from_str(s: str, expected: version.Version) -> None:
-    assert version.from_str() == expected
+def test_from_str(s: str, expected: Callable[[], version.Version]) -> None:
+    assert version.from_str(s) == expected()
+
+
+def test_from_str_unknown() -> None:
+    assert not version.from_str("unknown").is_known
+
+
+@pytest.mark.parametrize("s", ["1.2.3", "2020_01_25", "unknown"])
+def test_from_str_read_only(s: str) -> None:
+    # parsed versions are cached and shared between callers
+    with pytest.raises(AttributeError):
+        version.from_str(s).date = datetime.date(2000, 1, 1)  # type: ignore
+    with pytest.raises(AttributeError):
+        version.from_str(s).major = 3  # type: ignore
+
+
+def _response(status_code: int, text: str = "", **headers: str) -> mock.Mock:
+    return mock.Mock(status_code=status_code, text=text, headers=headers)
 
 
 def test_by_xpath() -> None:
-    assert False
+    url = "http://example.org/test_by_xpath"
+    session = mock.Mock()
+    session.get.return_value = _response(200, "<p id='v'>1.2.3</p>")
+    assert version.by_xpath(url, "//p[@id='v']", session=session) == "1.2.3"
+
+
+def test_by_xpath_revalidates() -> None:
+    url = "http://example.org/test_by_xpath_revalidates"
+    session = mock.Mock()
+    session.get.side_effect = [
+        _response(200, "<p>1.0</p>", ETag='"a"'),
+        _response(200, "<p>1.1</p>", ETag='"b"'),
+        _response(304),
+    ]
+    assert version.by_xpath(url, "//p", session=session) == "1.0"
+    assert version.by_xpath(url, "//p", session=session) == "1.1"
+    assert version.by_xpath(url, "//p", session=session) == "1.1"
+    headers = session.get.call_args.kwargs["headers"]
+    assert headers == {"If-None-Match": '"b"'}
+
+
+def test_by_xpath_cache_bounded() -> None:
+    session = mock.Mock()
+    session.get.side_effect = lambda *args, **kwargs: _response(
+        200, "<p>1.0</p>", ETag='"a"'
+    )
+    with mock.patch.object(version, "MAX_CACHED_PAGES", 2):
+        for i in range(3):
+            url = f"http://example.org/test_by_xpath_cache_bounded/{i}"
+            assert version.by_xpath(url, "//p", session=session) == "1.0"
+        assert len(version._CACHED_PAGES) <= 2
+        assert url in version._CACHED_PAGES
 
 
 def test_last_modified() -> None:
-    assert False
+    url = "http://example.org/test_last_modified"
+    session = mock.Mock()
+    session.head.return_value = _response(
+        200, **{"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}
+    )
+    modified = version.last_modified(url, session=session)
+    assert modified == datetime.datetime(2015, 10, 21, 7, 28)
+
+    # not memoized - changes and errors are reported on the next call
+    session.head.return_value = _response(
+        200, **{"Last-Modified": "Thu, 22 Oct 2015 07:28:00 GMT"}
+    )
+    modified = version.last_modified(url, session=session)
+    assert modified == datetime.datetime(2015, 10, 22, 7, 28)
+    session.head.return_value = _response(503)
+    assert version.last_modified(url, session=session) is None
+    session.head.return_value = _response(200, **{"Last-Modified": "garbage"})
+    assert version.last_modified(url, session=session) is None
+
+
+def test_last_modified_all() -> None:
+    urls = ["http://example.org/a", "http://example.org/b"]
+    session = mock.Mock()
+    session.head.side_effect = [
+        _response(200, **{"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}),
+        _response(404),
+    ]
+    assert version.last_modified_all(urls, session=session) == {
+        urls[0]: datetime.datetime(2015, 10, 21, 7, 28),
+        urls[1]: None,
+    }
+
+
+_D_2001_01_01 = datetime.date(2001, 1, 1)
+_D_2002_01_01 = datetime.date(2002, 1, 1)
 
 
 @pytest.mark.parametrize(
     "dates,expected",
     [
-        (
-            [
-                datetime.date(year=2001, month=1, day=1),
-                datetime.date(year=2002, month=1, day=1),
-            ],
-            datetime.date(year=2002, month=1, day=1),
-        ),
-        (
-            [
-                datetime.date(year=2002, month=1, day=1),
-            ],
-            datetime.date(year=2002, month=1, day=1),
-        ),
+        pytest.param([_D_2001_01_01, _D_2002_01_01], _D_2002_01_01, id="d2001_d2002"),
+        pytest.param([_D_2002_01_01], _D_2002_01_01, id="d2002"),
     ],
 )
 def test_recent(dates: Sequence[datetime.date], expected: datetime.date) -> None: